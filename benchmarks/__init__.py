@@ -0,0 +1,5 @@
+# benchmarks/__init__.py
+"""
+Benchmarks for the data structures and algorithms - run from the project root,
+e.g. python -m benchmarks.bench_linked_list
+"""
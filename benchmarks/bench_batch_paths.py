@@ -0,0 +1,37 @@
+# benchmarks/bench_batch_paths.py
+"""Batch pathfinding for 10,000 agents on one 200x200 map.
+
+find_paths runs one reverse BFS per distinct goal, so its time should
+follow the number of goals, not agents. The one-search-per-agent cost is
+extrapolated from SAMPLE separate find_path_to_hope calls.
+"""
+
+import random
+from benchmarks.timing import best_of
+from core.world import World
+from mechanics.pathfinding import PathFinder
+
+SIZE = 200
+AGENTS = 10000
+GOAL_COUNTS = [1, 20, 100]
+SAMPLE = 200
+
+def main():
+    world = World(SIZE, SIZE, seed=1)
+    pathfinder = PathFinder(world.map)
+    rng = random.Random(0)
+    open_cells = [(i % SIZE, i // SIZE) for i, room in enumerate(world.map.cells) if room]
+    starts = [rng.choice(open_cells) for _ in range(AGENTS)]
+    
+    print(f"{AGENTS} agents on a {SIZE}x{SIZE} map")
+    print(f"{'goals':>6} {'batch s':>8} {'per agent s (est.)':>19}")
+    for goal_count in GOAL_COUNTS:
+        goals = rng.sample(open_cells, goal_count)
+        requests = [(start, rng.choice(goals)) for start in starts]
+        batch = best_of(lambda: sum(1 for _ in pathfinder.find_paths(requests)), 1)
+        single = best_of(lambda: [pathfinder.find_path_to_hope(*start, *goal)
+                                  for start, goal in requests[:SAMPLE]], 1)
+        print(f"{goal_count:>6} {batch:8.2f} {single / SAMPLE * AGENTS:19.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_bfs.py
+"""Parent-pointer BFS against the path-copying BFS it replaced.
+
+Runs corner to corner on an open grid and on a maze, timing each search
+without tracing and measuring its peak memory with tracemalloc. The old
+search keeps a copy of the path per frontier cell, so it only runs up
+to BASELINE_LIMIT rooms a side unless --all is given. Tracing the
+1000x1000 open search makes up most of the run's minute or so.
+"""
+
+import random
+import sys
+from benchmarks.timing import best_of, peak_memory
+from data_structures.custom_queue import Queue
+from data_structures.grid import Grid, DIRECTIONS
+from mechanics.pathfinding import PathFinder
+
+SIZES = [200, 1000]
+BASELINE_LIMIT = 200
+
+def baseline_find_path(grid, start_x, start_y, hope_x, hope_y):
+    """find_path_to_hope as it was before, carrying a path copy per frontier cell."""
+    queue = Queue()
+    queue.enqueue(((start_x, start_y), [(start_x, start_y)]), priority=1)
+    visited = {(start_x, start_y)}
+    while not queue.is_empty():
+        (x, y), path = queue.dequeue()['data']
+        if x == hope_x and y == hope_y:
+            return path
+        for dx, dy in DIRECTIONS:
+            new_x, new_y = x + dx, y + dy
+            if grid.is_open(new_x, new_y) and (new_x, new_y) not in visited:
+                visited.add((new_x, new_y))
+                queue.enqueue(((new_x, new_y), path + [(new_x, new_y)]), priority=1)
+    return None
+
+def maze(size, seed=0):
+    """Perfect maze carved by a randomised depth-first search over odd cells."""
+    rng = random.Random(seed)
+    grid = Grid(size, size, 0)
+    grid.set(0, 0, 1)
+    stack = [(0, 0)]
+    while stack:
+        x, y = stack[-1]
+        options = [(x + 2 * dx, y + 2 * dy, dx, dy) for dx, dy in DIRECTIONS
+                   if grid.in_bounds(x + 2 * dx, y + 2 * dy) and grid.get(x + 2 * dx, y + 2 * dy) == 0]
+        if not options:
+            stack.pop()
+            continue
+        next_x, next_y, dx, dy = rng.choice(options)
+        grid.set(x + dx, y + dy, 1)
+        grid.set(next_x, next_y, 1)
+        stack.append((next_x, next_y))
+    return grid
+
+def main():
+    run_all = '--all' in sys.argv
+    print(f"{'grid':>13} {'steps':>7} {'old s':>7} {'old MB':>7} {'new s':>7} {'new MB':>7}")
+    for size in SIZES:
+        # Even sizes leave the far corner outside the maze's odd-cell lattice
+        goal = size - 1 if size % 2 else size - 2
+        for label, grid in (('open', Grid(size, size, 1)), ('maze', maze(size))):
+            search = lambda: PathFinder(grid).find_path_to_hope(0, 0, goal, goal)
+            new_time = best_of(search, 1)
+            new_peak, path = peak_memory(search)
+            if size <= BASELINE_LIMIT or run_all:
+                old_search = lambda: baseline_find_path(grid, 0, 0, goal, goal)
+                old_time = best_of(old_search, 1)
+                old_peak, _ = peak_memory(old_search)
+                old = f"{old_time:7.2f} {old_peak / 1e6:7.1f}"
+            else:
+                old = f"{'-':>7} {'-':>7}"
+            print(f"{f'{size}x{size} {label}':>13} {len(path) - 1:>7} {old} {new_time:7.2f} {new_peak / 1e6:7.1f}")
+
+if __name__ == '__main__':
+    main()
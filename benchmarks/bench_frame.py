@@ -0,0 +1,97 @@
+# benchmarks/bench_frame.py
+"""Write calls, bytes and time per game frame, printed directly versus buffered in a frame.
+
+Unbuffered, every Display call writes to stdout as it happens and each
+frame starts by clearing the screen. Buffered, display_current_state runs
+between Display.begin_frame and Display.end_frame, so a frame is one write
+that only redraws the lines that changed since the last one. Frames taller
+than the terminal are still repainted in full; the repaints column counts them.
+"""
+
+import os
+import random
+import sys
+import colorama
+from benchmarks.timing import best_of
+from core.game_state import GameState
+from core.world import World
+from utils.display import Display
+
+# A fixed terminal, so the counts don't depend on the window the benchmark runs in
+TERMINAL = os.terminal_size((100, 40))
+FRAMES = 200
+SIZES = [5, 200]
+
+class CountingStdout:
+    """Stand-in stdout that counts write calls, the bytes they carry and full repaints."""
+    def __init__(self):
+        self.writes = 0
+        self.bytes = 0
+        self.repaints = 0
+
+    def write(self, text):
+        self.writes += 1
+        self.bytes += len(text.encode())
+        self.repaints += text.startswith(Display.CLEAR)
+        return len(text)
+
+    def flush(self):
+        pass
+
+def walk(world, steps, seed=0):
+    """Positions of a random walk over open rooms from the start."""
+    rng = random.Random(seed)
+    x, y = 0, 0
+    positions = []
+    for _ in range(steps):
+        x, y = rng.choice(list(world.map.neighbours(x, y)) or [(x, y)])
+        positions.append((x, y))
+    return positions
+
+def render(game, positions, buffered):
+    """Draw one frame per position, as the game loop would."""
+    Display._screen_lines = None
+    for x, y in positions:
+        game.player.position = [x, y]
+        if buffered:
+            Display.begin_frame()
+            game.display_current_state()
+            Display.end_frame()
+        else:
+            game.display_current_state()
+
+def measure(game, positions, buffered, stdout):
+    """Render the frames with stdout swapped for another stream."""
+    real = sys.stdout
+    sys.stdout = stdout
+    try:
+        render(game, positions, buffered)
+    finally:
+        sys.stdout = real
+
+def main():
+    real_size = os.get_terminal_size
+    os.get_terminal_size = lambda *args: TERMINAL
+    devnull = open(os.devnull, 'w')
+    # The same wrapper colorama.init(autoreset=True) puts around the real stdout
+    terminal = colorama.AnsiToWin32(devnull, autoreset=True).stream
+    try:
+        print(f"{TERMINAL.columns}x{TERMINAL.lines} terminal, {FRAMES} frames, averages per frame")
+        print(f"{'map':>8} {'mode':>10} {'writes':>8} {'bytes':>8} {'us':>8} {'repaints':>9}")
+        for size in SIZES:
+            game = GameState(World(size, size, seed=1))
+            game.show_minimap = True
+            positions = walk(game.world, FRAMES)
+            for buffered in (False, True):
+                counter = CountingStdout()
+                measure(game, positions, buffered, counter)
+                seconds = best_of(lambda: measure(game, positions, buffered, terminal))
+                mode = 'buffered' if buffered else 'direct'
+                print(f"{f'{size}x{size}':>8} {mode:>10} {counter.writes / FRAMES:8.1f} "
+                      f"{counter.bytes / FRAMES:8.0f} {seconds / FRAMES * 1e6:8.0f} {counter.repaints:9}")
+    finally:
+        os.get_terminal_size = real_size
+        devnull.close()
+
+if __name__ == '__main__':
+    main()
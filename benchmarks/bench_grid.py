@@ -0,0 +1,35 @@
+# benchmarks/bench_grid.py
+"""Map generation and movement checks on square maps from 200 to 2000 rooms a side."""
+
+import random
+from benchmarks.timing import best_of
+from core.game_state import GameState
+from core.world import World
+
+SIZES = [200, 1000, 2000]
+CHECKS = 100000
+
+def main():
+    print(f"{'size':>6} {'generate ms':>12} {'is_open us':>11} {'is_valid_move us':>17}")
+    for size in SIZES:
+        generate = best_of(lambda: World(size, size, seed=1), 1 if size > 1000 else 3)
+        
+        world = World(size, size, seed=1)
+        rng = random.Random(0)
+        cells = [(rng.randrange(size), rng.randrange(size)) for _ in range(CHECKS)]
+        grid = world.map
+        is_open = best_of(lambda: [grid.is_open(x, y) for x, y in cells]) / CHECKS
+        
+        game = GameState(world)
+        commands = game.command_processor
+        directions = [rng.choice(['up', 'down', 'left', 'right']) for _ in range(CHECKS)]
+        
+        def valid_moves():
+            for (x, y), direction in zip(cells, directions):
+                game.player.position = [x, y]
+                commands.is_valid_move(direction)
+        move = best_of(valid_moves) / CHECKS
+        print(f"{size:>6} {generate * 1e3:12.1f} {is_open * 1e6:11.2f} {move * 1e6:17.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+# benchmarks/bench_linked_list.py
+"""Append and iteration cost of the memory LinkedList from 10 to 1,000,000 memories."""
+
+from benchmarks.timing import best_of
+from data_structures.custom_linked_list import LinkedList
+
+SIZES = [10, 100, 1000, 10000, 100000, 1000000]
+
+def fill(size):
+    journal = LinkedList()
+    for i in range(size):
+        journal.append({'text': f"memory {i}", 'hope_gained': i % 5})
+    return journal
+
+def main():
+    print(f"{'memories':>10} {'append us/op':>13} {'iterate ns/op':>14} {'reversed ns/op':>15}")
+    for size in SIZES:
+        repeat = 3 if size < 1000000 else 1
+        append = best_of(lambda: fill(size), repeat) / size
+        journal = fill(size)
+        forward = best_of(lambda: sum(1 for _ in journal), repeat) / size
+        backward = best_of(lambda: sum(1 for _ in reversed(journal)), repeat) / size
+        print(f"{size:>10} {append * 1e6:>13.2f} {forward * 1e9:>14.0f} {backward * 1e9:>15.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# benchmarks/bench_map_generation.py
+"""Bulk map generation at 5x5, 100x100 and 1000x1000.
+
+World.generate_many is timed per map and set against the generator it
+replaced, which filtered candidate lists with 'not in' checks.
+"""
+
+import random
+from benchmarks.timing import best_of
+from core.world import World
+
+RUNS = [(5, 2000), (100, 200), (1000, 10)]  # (size, maps generated)
+
+def baseline_generate(width, height, rng):
+    """The list-filtering generator as it was before."""
+    base_map = World.base_layout(width, height)
+    valid_positions = [(i % width, i // width) for i, room in enumerate(base_map.cells) if room == 1 and i != 0]
+    item_locations = rng.sample(valid_positions, 4)
+    remaining_positions = [p for p in valid_positions if p not in item_locations]
+    demon_locations = rng.sample(remaining_positions, 3)
+    remaining_positions = [p for p in remaining_positions if p not in demon_locations]
+    mirror_location = rng.choice(remaining_positions)
+    remaining_positions = [p for p in remaining_positions if p != mirror_location]
+    npc_locations = rng.sample(remaining_positions, 3)
+    for x, y in item_locations:
+        base_map.set(x, y, 4)
+    for x, y in demon_locations:
+        base_map.set(x, y, 3)
+    base_map.set(*mirror_location, 5)
+    for i, (x, y) in enumerate(npc_locations):
+        base_map.set(x, y, 6 + i)
+    return base_map
+
+def main():
+    print(f"{'size':>10} {'maps':>5} {'old ms/map':>11} {'new ms/map':>11}")
+    for size, count in RUNS:
+        new = best_of(lambda: World.generate_many(count, width=size, height=size), 1) / count
+        rng = random.Random(0)
+        old_count = max(count // 10, 1)
+        old = best_of(lambda: [baseline_generate(size, size, rng) for _ in range(old_count)], 1) / old_count
+        print(f"{f'{size}x{size}':>10} {count:>5} {old * 1e3:11.3f} {new * 1e3:11.3f}")
+
+if __name__ == '__main__':
+    main()
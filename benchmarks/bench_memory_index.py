@@ -0,0 +1,59 @@
+# benchmarks/bench_memory_index.py
+"""Keyword index against a linear journal scan on a 100,000-memory journal.
+
+Memories are random sentences over a fixed vocabulary, with one rare word
+planted in a handful of them. Index memory is measured with tracemalloc,
+with and without a max_postings cap.
+"""
+
+import random
+from benchmarks.timing import best_of, peak_memory
+from core.player import Player
+from data_structures.memory_index import MemoryIndex
+
+JOURNAL_SIZE = 100000
+RARE_WORD = "lighthouse"
+COMMON = ["you", "remember", "the", "light", "and", "a", "voice", "that", "said", "keep", "going"]
+
+def build_journal(size, rng):
+    vocabulary = COMMON + [f"word{i}" for i in range(5000)]
+    player = Player(index_memories=False)
+    for i in range(size):
+        words = rng.choices(vocabulary, k=12)
+        if i % (size // 10) == 0:
+            words.append(RARE_WORD)
+        player.add_memory(" ".join(words), hope_gained=rng.randint(0, 5))
+    return player
+
+def build_index(memories, max_postings=None):
+    index = MemoryIndex(max_postings)
+    for memory in memories:
+        index.add(memory)
+    return index
+
+def main():
+    rng = random.Random(0)
+    player = build_journal(JOURNAL_SIZE, rng)
+    memories = player.memories.display_all()
+    
+    build = best_of(lambda: build_index(memories), 1)
+    index_bytes, index = peak_memory(lambda: build_index(memories))
+    capped_bytes, _ = peak_memory(lambda: build_index(memories, max_postings=100))
+    print(f"{JOURNAL_SIZE} memories: index built in {build:.2f} s "
+          f"({build / JOURNAL_SIZE * 1e6:.1f} us/memory)")
+    print(f"index memory {index_bytes / 1e6:.1f} MB, {capped_bytes / 1e6:.1f} MB with max_postings=100")
+    
+    queries = [
+        ("rare word", (RARE_WORD,), {}),
+        ("prefix", ("lighth",), {'prefix': True}),
+        ("AND, top 10 by hope", (["voice", "going"],), {'rank': 'hope', 'limit': 10}),
+        ("OR, top 10 by recency", (["word1", "word2"],), {'mode': 'or', 'limit': 10}),
+    ]
+    print(f"{'query':>22} {'index ms':>9} {'scan ms':>8}")
+    for label, args, kwargs in queries:
+        index_time = best_of(lambda: index.search(*args, **kwargs), 5) * 1e3
+        scan_time = best_of(lambda: MemoryIndex.scan(memories, *args, **kwargs), 1) * 1e3
+        print(f"{label:>22} {index_time:9.2f} {scan_time:8.1f}")
+
+if __name__ == '__main__':
+    main()
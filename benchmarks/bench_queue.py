@@ -0,0 +1,61 @@
+# benchmarks/bench_queue.py
+"""Heap-backed event Queue against the sorted-list Queue it replaced.
+
+Each run enqueues N events and then drains the queue, once with a single
+priority (the FIFO fast path) and once with mixed priorities. The old
+queue is quadratic, so it is skipped above BASELINE_LIMIT events unless
+--all is given (20,000 events take it about 40 s).
+"""
+
+import random
+import sys
+from benchmarks.timing import best_of
+from data_structures.custom_queue import Queue
+
+SIZES = [1000, 5000, 20000]
+BASELINE_LIMIT = 5000
+
+class BaselineQueue:
+    """The sorted-list Queue as it was before the heap."""
+    def __init__(self):
+        self.items = []
+    
+    def enqueue(self, item, priority=2):
+        item_with_priority = item.copy() if isinstance(item, dict) else {'data': item}
+        item_with_priority['priority'] = priority
+        i = 0
+        while i < len(self.items) and self.items[i]['priority'] <= priority:
+            i += 1
+        self.items.insert(i, item_with_priority)
+    
+    def dequeue(self):
+        if self.is_empty():
+            return None
+        return self.items.pop(0)
+    
+    def is_empty(self):
+        return len(self.items) == 0
+
+def fill_and_drain(queue_class, priorities):
+    queue = queue_class()
+    for i, priority in enumerate(priorities):
+        queue.enqueue({'type': 'memory', 'step': i}, priority)
+    while not queue.is_empty():
+        queue.dequeue()
+
+def main():
+    run_all = '--all' in sys.argv
+    rng = random.Random(0)
+    print(f"{'events':>7} {'priorities':>10} {'old ms':>9} {'new ms':>8}")
+    for size in SIZES:
+        for label, priorities in (('single', [2] * size),
+                                  ('mixed', [rng.randint(1, 3) for _ in range(size)])):
+            new = best_of(lambda: fill_and_drain(Queue, priorities))
+            if size <= BASELINE_LIMIT or run_all:
+                old = f"{best_of(lambda: fill_and_drain(BaselineQueue, priorities), 1) * 1e3:9.1f}"
+            else:
+                old = f"{'skipped':>9}"
+            print(f"{size:>7} {label:>10} {old} {new * 1e3:8.1f}")
+
+if __name__ == '__main__':
+    main()
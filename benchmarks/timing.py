@@ -0,0 +1,35 @@
+# benchmarks/timing.py
+"""Timing helpers shared by the benchmark scripts."""
+
+import gc
+import time
+import tracemalloc
+
+def best_of(func, repeat=3):
+    """Fastest of several runs of func, in seconds.
+    
+    As in timeit, the garbage collector is off while timing, so big live
+    structures don't add collection passes to the numbers.
+    """
+    best = float('inf')
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if enabled:
+            gc.enable()
+    return best
+
+def peak_memory(func):
+    """Run func under tracemalloc and return (peak bytes, result)."""
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, result
@@ -1256,6 +1256,10 @@ class Dialogues:
     • s - Save your journey
     • h - Show this help menu
     • x - Examine mirror (when available)
+    • > or < - Take the stairs (when standing on them)
+    • r - Plan a route through the rooms still to visit
+    • g - Travel to the nearest item, mirror, person or a coordinate
+    • o - Show or hide the overview map (on maps bigger than the screen)
     
     YOUR JOURNEY:
     Navigate the dungeon by moving between rooms.
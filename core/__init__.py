@@ -6,5 +6,6 @@ Core game components - The foundation of the journey
 from .game_state import GameState
 from .player import Player
 from .world import World
+from .dungeon import Dungeon
 
-__all__ = ['GameState', 'Player', 'World']
\ No newline at end of file
+__all__ = ['GameState', 'Player', 'World', 'Dungeon']
\ No newline at end of file
@@ -0,0 +1,283 @@
+# core/dungeon.py
+"""Multi-floor dungeon made of World floors joined by stairs."""
+
+import heapq
+import os
+import random
+import shutil
+from core.world import World
+from data_structures.grid import Grid
+from mechanics.pathfinding import PathFinder
+
+class Dungeon:
+    """Stack of floors, one World each, joined by staircases.
+
+    Staircase j runs from a down stair on floor k to an up stair on floor
+    k + 1. Every floor keeps a small table of walking distances between its
+    own stairs, so a route across floors is found on the graph of stairs
+    instead of searching every floor room by room.
+
+    Floors are generated from (seed, floor) when first visited. Only the
+    current floor and its neighbours stay in memory; floors further away
+    are dropped, and if the player changed or explored them they are first
+    written to page_dir (a temporary folder when none is given).
+    """
+
+    STAIRS_DOWN = 9
+    STAIRS_UP = 10
+    STAIR_STEP = 1  # Steps counted for taking a staircase
+    GOAL = (-1, -1)  # Route search node for the goal room
+
+    def __init__(self, floors=5, width=5, height=5, seed=None, stairs_per_floor=1,
+                 wall_density=0.0, page_dir=None):
+        self.floor_count = floors
+        self.width = width
+        self.height = height
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.stairs_per_floor = stairs_per_floor
+        self.wall_density = wall_density
+        self.page_dir = page_dir or World.scratch_dir('floors')
+        self.current = 0
+
+        self.floors = {}        # floor -> World, for floors in memory
+        self.stairs = {}        # floor -> {'up': [(x, y), ...], 'down': [(x, y), ...]}
+        self.stair_tables = {}  # floor -> (world version, {(stair, stair): steps})
+        self.pristine = {}      # floor -> world version when it was generated or loaded
+        self.generated = 0
+        self.page_outs = 0
+        os.makedirs(self.page_dir, exist_ok=True)
+
+    @property
+    def world(self):
+        """World of the floor the player is on."""
+        return self.floor(self.current)
+
+    def _page_path(self, floor):
+        return os.path.join(self.page_dir, f"floor_{floor}.bin")
+
+    def floor(self, floor):
+        """World for a floor, loading or generating it if it isn't in memory."""
+        world = self.floors.get(floor)
+        if world is not None:
+            return world
+        if not 0 <= floor < self.floor_count:
+            raise IndexError(f"No floor {floor} in a {self.floor_count}-floor dungeon")
+
+        world = self._generate_floor(floor)
+        if os.path.exists(self._page_path(floor)):
+            # Paged floors hold the room types followed by the explored bitmap
+            with open(self._page_path(floor), 'rb') as f:
+                data = f.read()
+            size = self.width * self.height
+            saved = Grid(self.width, self.height)
+            saved.cells[:] = data[:size]
+            world.replace_map(saved)
+            world.explored[:] = data[size:]
+            self.stair_tables.pop(floor, None)  # Recomputed for the reloaded World
+
+        self.floors[floor] = world
+        self.pristine[floor] = world.version
+        return world
+
+    def _generate_floor(self, floor):
+        """Build a floor from its seed and place its stairs."""
+        rng = random.Random(f"{self.seed}:{floor}")
+        # The first floor starts at the usual corner; others where their stairs arrive
+        if floor == 0:
+            arrival = (0, 0)
+        else:
+            arrival = (rng.randrange(self.width), rng.randrange(self.height))
+        ups = self.stairs_per_floor if floor > 0 else 0
+        downs = self.stairs_per_floor if floor < self.floor_count - 1 else 0
+        needed = downs + max(ups - 1, 0)
+
+        # Stairs go on empty rooms reachable from the arrival, so they all connect
+        width = self.width
+        arrival_index = arrival[1] * width + arrival[0]
+        for _ in range(World.MAX_GENERATION_ATTEMPTS):
+            world = World(self.width, self.height, seed=rng.randrange(2 ** 32),
+                          wall_density=self.wall_density, start=arrival)
+            reachable = world.map.connected_mask(*arrival)
+            free = [i for i, room in enumerate(world.map.cells)
+                    if room == 1 and reachable[i] and i != arrival_index]
+            if len(free) >= needed:
+                break
+        else:
+            raise ValueError(f"Could not fit {needed} stairs on floor {floor}")
+        self.generated += 1
+        chosen = [(i % width, i // width) for i in rng.sample(free, needed)]
+
+        up_stairs = ([arrival] + chosen[:ups - 1]) if ups else []
+        down_stairs = chosen[len(chosen) - downs:]
+        for x, y in up_stairs:
+            world.set_room(x, y, self.STAIRS_UP)
+        for x, y in down_stairs:
+            world.set_room(x, y, self.STAIRS_DOWN)
+        self.stairs[floor] = {'up': up_stairs, 'down': down_stairs}
+        return world
+
+    def _is_modified(self, floor):
+        world = self.floors[floor]
+        return world.version != self.pristine[floor] or 1 in world.explored
+
+    def _page_out(self, floor):
+        """Write a floor's rooms and explored bitmap to page_dir."""
+        world = self.floors[floor]
+        with open(self._page_path(floor), 'wb') as f:
+            f.write(world.map.cells)
+            f.write(world.explored)
+        self.pristine[floor] = world.version
+        self.page_outs += 1
+
+    def trim(self):
+        """Drop floors that aren't next to the current one."""
+        for floor in list(self.floors):
+            if abs(floor - self.current) <= 1:
+                continue
+            if self._is_modified(floor):
+                self._page_out(floor)
+            del self.floors[floor]
+
+    def flush(self):
+        """Write every changed floor in memory to page_dir."""
+        for floor in list(self.floors):
+            if self._is_modified(floor):
+                self._page_out(floor)
+    
+    def save_floors(self, folder):
+        """Copy every changed floor to folder, replacing what it held."""
+        self.flush()
+        if os.path.abspath(folder) == os.path.abspath(self.page_dir):
+            return
+        if os.path.exists(folder):
+            shutil.rmtree(folder)
+        shutil.copytree(self.page_dir, folder)
+    
+    def load_floors(self, folder):
+        """Copy the changed floors saved in folder into page_dir, before any floor is loaded."""
+        for name in os.listdir(folder):
+            shutil.copy(os.path.join(folder, name), self.page_dir)
+
+    def go_to_floor(self, floor):
+        """Make a floor the current one and return its World."""
+        world = self.floor(floor)
+        self.current = floor
+        self.trim()
+        return world
+
+    def take_stairs(self, x, y):
+        """Use the staircase at (x, y) on the current floor.
+
+        Returns the new floor number and the arrival position.
+        """
+        stairs = self.stairs[self.current]
+        if (x, y) in stairs['down']:
+            j, floor, side = stairs['down'].index((x, y)), self.current + 1, 'up'
+        elif (x, y) in stairs['up']:
+            j, floor, side = stairs['up'].index((x, y)), self.current - 1, 'down'
+        else:
+            raise ValueError(f"No stairs at {(x, y)} on floor {self.current}")
+
+        self.go_to_floor(floor)
+        return floor, self.stairs[floor][side][j]
+
+    def floor_stairs(self, floor):
+        """Up and down stair positions of a floor, generating it if never seen."""
+        if floor not in self.stairs:
+            self.floor(floor)
+        return self.stairs[floor]
+
+    def stair_table(self, floor):
+        """Walking distances between every pair of stairs on a floor."""
+        cached = self.stair_tables.get(floor)
+        if cached is not None and floor not in self.floors:
+            return cached[1]  # Floors out of memory can't have changed
+        world = self.floor(floor)
+        if cached is not None and cached[0] == world.version:
+            return cached[1]
+
+        pathfinder = PathFinder(world.map)
+        stairs = self.stairs[floor]['up'] + self.stairs[floor]['down']
+        table = {}
+        for stair in stairs:
+            field = pathfinder.distance_field_to([stair])
+            for other in stairs:
+                steps = field.distance_from(*other)
+                if steps is not None:
+                    table[(stair, other)] = steps
+        self.stair_tables[floor] = (world.version, table)
+        return table
+
+    def route(self, from_floor, start, to_floor, goal):
+        """Shortest route between rooms on any two floors.
+
+        Returns (steps, stairs) where stairs lists the (floor, (x, y)) of
+        each staircase taken, or None if the goal can't be reached. The
+        search runs over stairs, using the floors' stair tables, plus one
+        BFS on each end floor. A detour through another floor is taken
+        when its stairs are closer together than the walk on this one.
+        """
+        start_field = PathFinder(self.floor(from_floor).map).distance_field_to([start])
+        goal_field = PathFinder(self.floor(to_floor).map).distance_field_to([goal])
+
+        # Nodes are (floor, (x, y)); GOAL marks having reached the goal room
+        best = {(from_floor, start): 0}
+        came_from = {}
+        open_set = [(0, from_floor, start)]
+        while open_set:
+            steps, floor, position = heapq.heappop(open_set)
+            if position == self.GOAL:
+                break
+            if steps > best[(floor, position)]:
+                continue
+
+            edges = []
+            if floor == to_floor:
+                to_goal = goal_field.distance_from(*position)
+                if to_goal is not None:
+                    edges.append((to_goal, floor, self.GOAL))
+
+            # Walk to the other stairs on this floor
+            if (floor, position) == (from_floor, start):
+                for stair in self.stairs[floor]['up'] + self.stairs[floor]['down']:
+                    walk = start_field.distance_from(*stair)
+                    if walk is not None and stair != start:
+                        edges.append((walk, floor, stair))
+            else:
+                for (stair, other), walk in self.stair_table(floor).items():
+                    if stair == position and other != position:
+                        edges.append((walk, floor, other))
+
+            # Take the staircase this room belongs to
+            for side, step, other_side in (('down', 1, 'up'), ('up', -1, 'down')):
+                if position in self.stairs[floor][side]:
+                    j = self.stairs[floor][side].index(position)
+                    other = self.floor_stairs(floor + step)[other_side][j]
+                    edges.append((self.STAIR_STEP, floor + step, other))
+
+            for cost, next_floor, next_position in edges:
+                key = (next_floor, next_position)
+                if steps + cost < best.get(key, float('inf')):
+                    best[key] = steps + cost
+                    came_from[key] = (floor, position)
+                    heapq.heappush(open_set, (steps + cost, next_floor, next_position))
+
+        self.trim()
+        if (to_floor, self.GOAL) not in best:
+            return None
+
+        # Walk back through the nodes and keep the stairs that were climbed
+        taken = []
+        node = came_from[(to_floor, self.GOAL)]
+        while node in came_from:
+            previous = came_from[node]
+            if previous[0] != node[0]:
+                taken.append(previous)
+            node = previous
+        taken.reverse()
+        return best[(to_floor, self.GOAL)], taken
+
+    def distance(self, from_floor, start, to_floor, goal):
+        """Steps between rooms on any two floors, or None if unreachable."""
+        found = self.route(from_floor, start, to_floor, goal)
+        return found[0] if found else None
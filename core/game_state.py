@@ -6,29 +6,45 @@ from core.player import Player
 from core.world import World
 from data_structures.custom_stack import Stack
 from data_structures.custom_queue import Queue
+from mechanics.path_cache import PathCache
+from mechanics.route_planner import RoutePlanner
 from content.dialogues import Dialogues
 from utils.display import Display
 
 class GameState:
     """Manages the overall game state and progression."""
     
-    def __init__(self):
+    VIEW_RADIUS = 10  # Rooms shown around the player on endless maps
+    
+    def __init__(self, world=None, dungeon=None):
         self.player = Player()
-        self.world = World()
+        self.dungeon = dungeon  # Optional multi-floor Dungeon; world is then its current floor
+        self.world = dungeon.world if dungeon else (world or World())
         self.game_phase = "rock_bottom"
         self.running = True
         self.demons_faced = 0  # Milestone tracking
         self.items_collected = 0  # Milestone tracking
         self.npcs_visited = 0   # Track NPC interactions
+        self.show_minimap = False  # Overview of maps bigger than the screen, toggled with 'o'
         
         # Initialize data structures
-        self.move_history = Stack()  # For backtracking (Week 5)
+        self.move_history = Stack(typecode='i')  # For backtracking (Week 5); 'i' fits endless coordinates
         self.event_queue = Queue()   # For turn-based events (Week 5)
+        self.path_cache = PathCache(self.world)  # Pathfinding results for the current map
+        self.route_planner = RoutePlanner(self.world)  # Visiting orders for the current map
         
         # Command processor needs to be imported here to avoid circular imports
         from mechanics.commands import CommandProcessor
         self.command_processor = CommandProcessor(self)
         
+    def enter_floor(self, position):
+        """Switch to the dungeon's current floor, arriving at position."""
+        self.world = self.dungeon.world
+        self.path_cache = PathCache(self.world)
+        self.route_planner = RoutePlanner(self.world)
+        self.player.position = list(position)
+        self.move_history.clear()  # Undo doesn't lead back up the stairs
+    
     def start_new_game(self):
         """Begin a new journey."""
         Display.clear_screen()
@@ -63,7 +79,8 @@ class GameState:
                 self.game_over()
                 break
                 
-            # Display current state
+            # Display current state, written to the terminal in one go with the input hint
+            Display.begin_frame()
             self.display_current_state()
             
             # Get player input
@@ -82,13 +99,20 @@ class GameState:
         Display.print_status_bar(self.player.hope, self.player.burden)
         
         # Display revealed map
-        from mechanics.pathfinding import PathFinder
-        pathfinder = PathFinder(self.world.map)
-        revealed_map = pathfinder.reveal_fog_of_war(self.player.position[0], self.player.position[1])
-        Display.display_map(self.world.map, self.player.position[0], self.player.position[1], revealed_map)
+        x, y = self.player.position
+        if self.world.endless:
+            # Only the rooms around the player exist in memory, so show a window
+            revealed_map, (left, top) = self.path_cache.reveal_window(x, y, self.VIEW_RADIUS)
+            Display.display_map(self.world.map, x - left, y - top, revealed_map)
+        else:
+            revealed_map = self.path_cache.reveal_fog_of_war(x, y)
+            Display.display_map(self.world.map, x, y, revealed_map)
+            
+            # Maps bigger than the screen can also show a coarse overview
+            if self.show_minimap and self.map_exceeds_viewport():
+                Display.display_minimap(self.path_cache.minimap(), x, y)
         
         # Display player position with room type
-        x, y = self.player.position
         room_type = self.world.map[y][x]
         Display.print_position(x, y, room_type)
         
@@ -105,19 +129,25 @@ class GameState:
         available_actions = self.get_available_actions()
         Display.print_actions(available_actions)
     
+    def map_exceeds_viewport(self):
+        """Check if the whole map doesn't fit in the map viewport."""
+        view_width, view_height = Display.viewport_size()
+        return self.world.width > view_width or self.world.height > view_height
+    
     def get_available_actions(self):
         """Get list of available actions in current room."""
         x, y = self.player.position
         actions = []
         
         # Movement options
-        if y > 0 and self.world.map[y-1][x] != 0:
+        world_map = self.world.map
+        if world_map.is_open(x, y - 1):
             actions.append(("↑", "Move Up"))
-        if y < 4 and self.world.map[y+1][x] != 0:
+        if world_map.is_open(x, y + 1):
             actions.append(("↓", "Move Down"))
-        if x < 4 and self.world.map[y][x+1] != 0:
+        if world_map.is_open(x + 1, y):
             actions.append(("→", "Move Right"))
-        if x > 0 and self.world.map[y][x-1] != 0:
+        if world_map.is_open(x - 1, y):
             actions.append(("←", "Move Left"))
         
         # Standard actions
@@ -128,6 +158,8 @@ class GameState:
             ("s", "Save game"),
             ("h", "Help")
         ])
+        if not self.world.endless and self.map_exceeds_viewport():
+            actions.append(("o", "Overview map"))
         
         # Room-specific actions
         room_type = self.world.map[y][x]
@@ -139,6 +171,10 @@ class GameState:
             actions.append(("x", "Examine mirror"))
         elif room_type in [6, 7, 8]:  # NPC rooms
             actions.append(("k", "Talk to person"))
+        elif room_type == 9 and self.dungeon:  # Stairs down
+            actions.append((">", "Go down the stairs"))
+        elif room_type == 10 and self.dungeon:  # Stairs up
+            actions.append(("<", "Climb the stairs"))
         
         return actions
     
@@ -239,12 +275,11 @@ class GameState:
             self.transition_to_phase("glory")
             self.complete_journey()
         
-        # If phase changed, regenerate the map to ensure demons in all phases
-        if old_phase != self.game_phase and self.game_phase != "glory":
-            current_pos = self.player.position
-            self.world.regenerate_map_for_phase(self.game_phase)
-            # Ensure player's location is still valid
-            self.world.map[current_pos[1]][current_pos[0]] = 1
+        # If phase changed, regenerate the map to ensure demons in all phases.
+        # Dungeon floors keep their maps so their stairs stay where they are.
+        if old_phase != self.game_phase and self.game_phase != "glory" and not self.dungeon:
+            # Generate around the player's location so it stays valid and connected
+            self.world.regenerate_map_for_phase(self.game_phase, tuple(self.player.position))
     
     def transition_to_phase(self, phase):
         """Transition to a new phase of the journey."""
@@ -304,13 +339,14 @@ class GameState:
         print("You chose to keep going.")
         
         # Hope progression chart
-        memories = self.player.memories.display_all()
+        # Bucket hope gains into time windows rather than walking every memory
+        windows = min(len(self.player.memories), 10)
         hope_history = [10]
         current_hope = 10
         
-        for memory in memories:
-            if memory.get('hope_gained', 0) != 0:
-                current_hope += memory.get('hope_gained', 0)
+        for gained in self.player.memory_timeline.hope_by_window(windows):
+            if gained != 0:
+                current_hope += int(gained)
                 hope_history.append(current_hope)
         
         if len(hope_history) > 1:
@@ -2,12 +2,14 @@
 """Player character module."""
 
 from data_structures.custom_linked_list import LinkedList
+from data_structures.memory_index import MemoryIndex
+from data_structures.memory_timeline import MemoryTimeline
 from datetime import datetime
 
 class Player:
     """Player character with emotional stats and inventory."""
     
-    def __init__(self, name="Lost Soul"):
+    def __init__(self, name="Lost Soul", index_memories=True, max_postings=None):
         self.name = name
         self.position = [0, 0]  # Starting position
         
@@ -22,18 +24,57 @@ class Player:
         
         # Memory/Journal as linked list (Week 4)
         self.memories = LinkedList()
+        # Uncapped, the index grows with the journal; see MemoryIndex for what a cap trades away
+        self.memory_index = MemoryIndex(max_postings) if index_memories else None
+        self.memory_timeline = MemoryTimeline()
         
         # Current emotional state
         self.state = "broken"
     
     def add_memory(self, memory, hope_gained=0):
         """Add a significant memory/realization with timestamp."""
-        self.memories.append({
+        now = datetime.now()
+        self._record_memory({
             'text': memory,
             'hope_gained': hope_gained,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now.isoformat(),
+            'time': now.timestamp()
         })
     
+    def load_memories(self, memories):
+        """Replace the journal with previously saved memories."""
+        self.memories = LinkedList()
+        self.memory_timeline = MemoryTimeline()
+        if self.memory_index is not None:
+            self.memory_index = MemoryIndex(self.memory_index.max_postings)
+        for memory in memories:
+            if 'time' not in memory:
+                # Older saves only stored the ISO timestamp
+                memory['time'] = datetime.fromisoformat(memory['timestamp']).timestamp()
+            self._record_memory(memory)
+    
+    def _record_memory(self, entry):
+        """Append a memory to the journal and keep the timeline and keyword index current."""
+        self.memories.append(entry)
+        self.memory_timeline.add(entry, entry['time'])
+        if self.memory_index is not None:
+            self.memory_index.add(entry)
+    
+    def memories_between(self, start, end):
+        """Memories recorded between two epoch times (inclusive), oldest first."""
+        return self.memory_timeline.between(start, end)
+    
+    def memories_since(self, start):
+        """Memories recorded at or after an epoch time, oldest first."""
+        return self.memory_timeline.since(start)
+    
+    def search_memories(self, terms, mode='and', prefix=False, rank='recency', limit=None):
+        """Find memories by keyword, using the index when it is enabled."""
+        if self.memory_index is not None:
+            return self.memory_index.search(terms, mode, prefix, rank, limit)
+        # Without an index, scan the journal with the same matching rules
+        return MemoryIndex.scan(self.memories, terms, mode, prefix, rank, limit)
+    
     def gain_item(self, item, game_state=None):
         """Add an item to inventory and apply its effects."""
         self.inventory.append(item)
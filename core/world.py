@@ -1,81 +1,369 @@
 # core/world.py
 """World map and room management."""
 
+import atexit
+import os
 import random
+import shutil
+import tempfile
+from data_structures.grid import Grid
+from data_structures.chunked_grid import ChunkedGrid
+from data_structures.mapped_grid import MappedGrid
 
 class World:
     """Manages the dungeon map and room descriptions."""
     
-    def __init__(self):
+    MAX_CHANGE_LOG = 256  # Cell writes remembered for incremental cache repair
+    
+    # Special rooms placed on every map, in placement order
+    # 3 = Demon, 4 = Item, 5 = Mirror, 6 = Therapist, 7 = Loved One, 8 = Stranger
+    SPECIAL_ROOMS = [4, 4, 4, 4, 3, 3, 3, 5, 6, 7, 8]
+    
+    MAX_GENERATION_ATTEMPTS = 20  # Layouts tried before giving up on a map
+    
+    def __init__(self, width=5, height=5, seed=None, wall_density=0.0,
+                 endless=False, chunk_size=32, chunk_dir=None, map_file=None, start=(0, 0)):
+        self.width = width
+        self.height = height
+        self.rng = random.Random(seed)  # Own generator so maps can be reproduced
+        self.wall_density = wall_density  # Share of rooms turned into extra random walls
+        self.generation_report = {}  # Retries and sealed rooms from the last generation
+        
+        # Endless worlds are built chunk by chunk as the player approaches
+        self.endless = endless
+        self.seed = seed if seed is not None else self.rng.randrange(2 ** 32)
+        self.chunk_size = chunk_size
+        self.chunk_dir = chunk_dir  # Where modified chunks are kept when evicted; a temp folder if None
+        self.map_generation = 0     # Bumped per regenerated endless map so chunk seeds differ
+        
+        # Optional file the map is memory-mapped from instead of living in RAM
+        self.map_file = None if endless else map_file
+        
         # 2D matrix representing the dungeon (Week 1)
-        self.map = self._create_emotional_map()
+        self.map = self._create_emotional_map(start)
         self.current_room = None
         
-    def _create_emotional_map(self):
-        """Create a 5x5 dungeon where each room represents an emotional state."""
-        return self.generate_emotional_journey_map()
+        # Rooms the player has seen; they stay revealed through the fog
+        self.explored = self._create_explored(self.map)
+        
+        # Room type -> coordinates of every special room of that type
+        self.room_index = self._index_rooms(self.map)
+        
+        # Bumped on every map write so derived data knows when it is stale
+        self.version = 0
+        self._change_log = []       # (x, y, old_type, new_type), one per version
+        self._change_log_base = 0   # Version just before the first logged change
+        
+    def _create_emotional_map(self, start=(0, 0)):
+        """Create a dungeon where each room represents an emotional state."""
+        if self.endless:
+            return self._create_chunked_map()
+        return self._store(self.generate_emotional_journey_map(start))
+    
+    def _store(self, new_map):
+        """Move a freshly generated map into the map file, if the world has one."""
+        if not self.map_file:
+            return new_map
+        current = getattr(self, 'map', None)
+        if (isinstance(current, MappedGrid) and current.path == self.map_file
+                and (current.width, current.height) == (new_map.width, new_map.height)):
+            # Same file and size: write through the existing mapping
+            current.load(new_map)
+            return current
+        return MappedGrid.create(self.map_file, new_map)
+    
+    def use_map_file(self, path):
+        """Move the current map into a memory-mapped file at path."""
+        self.map_file = path
+        self.map = self._store(self.map)
+    
+    def open_map_file(self, path, width, height, checksum=None):
+        """Map an existing map file, checking it against a saved checksum."""
+        new_map = MappedGrid(path, width, height)
+        if checksum is not None and new_map.checksum() != checksum:
+            raise ValueError(f"Map file {path} has changed since it was saved")
+        self.endless = False
+        self.map_file = path
+        self.replace_map(new_map)
+    
+    def save_map_file(self, path):
+        """Copy the map file to path and return the copy's checksum."""
+        self.map.flush()
+        if os.path.abspath(path) != os.path.abspath(self.map_file):
+            shutil.copyfile(self.map_file, path)
+        return self.map.checksum()
+    
+    def restore_map_file(self, path, width, height, checksum=None):
+        """Reopen a saved map file, playing on in a copy so the save stays as it was."""
+        working = os.path.join(World.scratch_dir('map'), os.path.basename(path))
+        shutil.copyfile(path, working)
+        self.open_map_file(working, width, height, checksum)
+    
+    def _create_chunked_map(self):
+        """Create an endless map whose chunks are generated from (seed, chunk_x, chunk_y)."""
+        if self.chunk_size % 2:
+            raise ValueError("chunk_size must be even so pillars line up across chunks")
+        layout = World.base_layout(self.chunk_size, self.chunk_size)
+        seed, generation = self.seed, self.map_generation
+        
+        def generate_chunk(chunk_x, chunk_y):
+            # String seeds hash the same way on every run, so chunks are reproducible
+            rng = random.Random(f"{seed}:{generation}:{chunk_x}:{chunk_y}")
+            # Chunks keep the open pillar layout so neighbouring chunks always connect
+            return World.generate_map(self.chunk_size, self.chunk_size, rng, layout)
+        
+        return ChunkedGrid(self.chunk_size, generate_chunk, spill_dir=self._chunk_spill_dir('map'))
+    
+    def _chunk_spill_dir(self, name):
+        if not self.chunk_dir:
+            # Modified chunks can only leave memory if there is somewhere to put them
+            self.chunk_dir = World.scratch_dir('chunks')
+        return os.path.join(self.chunk_dir, f"{name}_{self.map_generation}")
+    
+    @staticmethod
+    def scratch_dir(name):
+        """New temporary folder that is removed when the game exits."""
+        path = tempfile.mkdtemp(prefix=f"soul_dungeon_{name}_")
+        atexit.register(shutil.rmtree, path, True)
+        return path
+    
+    def _create_explored(self, world_map):
+        """Empty explored-rooms bitmap sized for the map."""
+        if isinstance(world_map, ChunkedGrid):
+            size = self.chunk_size
+            return ChunkedGrid(size, lambda chunk_x, chunk_y: Grid(size, size),
+                               spill_dir=self._chunk_spill_dir('explored'))
+        return bytearray(world_map.width * world_map.height)
+    
+    @staticmethod
+    def _index_rooms(world_map):
+        """Map each special room type (2 and up) to the set of its coordinates.
+        
+        Endless maps have no index since most of their chunks don't exist yet.
+        """
+        if isinstance(world_map, ChunkedGrid):
+            return None
+        index = {}
+        # Dropping walls and empty rooms leaves just the special types present
+        for room_type in set(world_map.cells[:].translate(None, b'\x00\x01')):
+            index[room_type] = set(world_map.positions_of(room_type))
+        return index
+    
+    def rooms_of_type(self, room_type):
+        """Coordinates of every room of a special type, without scanning the map."""
+        if self.room_index is None:
+            raise ValueError("Endless worlds don't index their rooms")
+        if room_type < 2:
+            raise ValueError("Only special room types (2 and up) are indexed")
+        return set(self.room_index.get(room_type, ()))
+    
+    def count_rooms(self, room_type):
+        """Number of rooms of a special type left on the map."""
+        if self.room_index is None:
+            raise ValueError("Endless worlds don't index their rooms")
+        if room_type < 2:
+            raise ValueError("Only special room types (2 and up) are indexed")
+        return len(self.room_index.get(room_type, ()))
+    
+    def window_around(self, x, y, radius, layer='map'):
+        """Plain Grid covering radius rooms around (x, y), plus its top-left corner.
+        
+        layer is 'map' for room types or 'explored' for the explored bitmap.
+        Searches on endless maps run over such a window, so their cost is
+        set by the radius rather than by how far the player has walked.
+        """
+        source = self.map if layer == 'map' else self.explored
+        left, top = max(0, x - radius), max(0, y - radius)
+        size = 2 * radius + 1
+        if isinstance(source, ChunkedGrid):
+            return source.window(left, top, size, size), (left, top)
+        
+        cells = source.cells if isinstance(source, Grid) else source
+        window = Grid(size, size)
+        right = min(left + size, self.width)
+        for row in range(top, min(top + size, self.height)):
+            piece = cells[row * self.width + left:row * self.width + right]
+            window.cells[(row - top) * size:(row - top) * size + right - left] = piece
+        return window, (left, top)
+    
+    def save_chunks(self, folder):
+        """Copy the changed chunks of an endless world to folder, replacing what it held."""
+        self.map.flush()
+        self.explored.flush()
+        if os.path.abspath(folder) == os.path.abspath(self.chunk_dir):
+            return
+        if os.path.exists(folder):
+            shutil.rmtree(folder)
+        for grid in (self.map, self.explored):
+            shutil.copytree(grid.spill_dir, os.path.join(folder, os.path.basename(grid.spill_dir)))
+    
+    def restore_endless(self, seed, chunk_size, chunk_dir, map_generation):
+        """Reopen a saved endless world from its seed and saved chunks."""
+        self.endless = True
+        self.map_file = None
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.map_generation = map_generation
+        # Play goes on in a copy, so chunks spilled later don't change the save
+        self.chunk_dir = World.scratch_dir('chunks')
+        for name in ('map', 'explored'):
+            saved = os.path.join(chunk_dir, f"{name}_{map_generation}")
+            if os.path.isdir(saved):
+                shutil.copytree(saved, self._chunk_spill_dir(name))
+        self.replace_map(self._create_chunked_map())
     
-    def generate_emotional_journey_map(self):
+    def mark_explored(self, x, y):
+        """Record that the player has seen a room."""
+        if isinstance(self.explored, ChunkedGrid):
+            self.explored.set(x, y, 1)
+        else:
+            self.explored[y * self.width + x] = 1
+    
+    def generate_emotional_journey_map(self, start=(0, 0)):
         """Generate a map with randomized item, demon, and NPC locations."""
-        # Create a more open map with fewer walls
-        # 0 = Wall, 1 = Empty, 3 = Demon, 4 = Item, 5 = Mirror, 6 = Therapist, 7 = Loved One, 8 = Stranger
-        base_map = [
-            [1, 1, 1, 1, 1],
-            [1, 0, 1, 0, 1],
-            [1, 1, 1, 1, 1],
-            [1, 0, 1, 0, 1],
-            [1, 1, 1, 1, 1]
-        ]
-        
-        # Ensure at least one path through the map
-        valid_positions = [(x, y) for y in range(5) for x in range(5) if base_map[y][x] == 1 and (x, y) != (0, 0)]
-        
-        # Place special rooms
-        item_count = 4  # More items
-        demon_count = 3  # More demons
-        npc_count = 3   # Three NPCs (therapist, loved one, stranger)
-        
-        # Place items
-        item_locations = random.sample(valid_positions, item_count)
-        remaining_positions = [p for p in valid_positions if p not in item_locations]
-        
-        # Place demons
-        demon_locations = random.sample(remaining_positions, demon_count)
-        remaining_positions = [p for p in remaining_positions if p not in demon_locations]
-        
-        # Place mirror
-        mirror_location = random.choice(remaining_positions)
-        remaining_positions = [p for p in remaining_positions if p != mirror_location]
-        
-        # Place NPCs
-        npc_locations = random.sample(remaining_positions, npc_count)
-        
-        # Apply to map
-        for x, y in item_locations:
-            base_map[y][x] = 4  # Item room
-        
-        for x, y in demon_locations:
-            base_map[y][x] = 3  # Demon room
+        self.generation_report = {}
+        return World.generate_map(self.width, self.height, self.rng, wall_density=self.wall_density,
+                                  start=start, report=self.generation_report)
+    
+    @staticmethod
+    def base_layout(width, height):
+        """Empty map with the pillar pattern (0 = Wall, 1 = Empty)."""
+        base_map = Grid(width, height, fill=1)
+        
+        # Pillars on every odd row/column keep the map open (the classic 5x5 layout)
+        pillars = bytes(width // 2)
+        for y in range(1, height, 2):
+            base_map.cells[y * width + 1:(y + 1) * width:2] = pillars
+        return base_map
+    
+    @staticmethod
+    def generate_map(width, height, rng, layout=None, wall_density=0.0, start=(0, 0), report=None):
+        """Place the special rooms on a copy of the layout using the given Random.
+        
+        layout must be a pillar layout from base_layout. Every special room
+        is guaranteed reachable from start: after random walls are added,
+        rooms cut off from start are sealed into walls, and a layout left
+        with too few open rooms is rejected and retried. If report is a
+        dict, it receives the retry and sealed-room counts.
+        """
+        wanted = len(World.SPECIAL_ROOMS)
+        start_x, start_y = start
+        start_index = start_y * width + start_x
+        
+        for attempt in range(World.MAX_GENERATION_ATTEMPTS):
+            base_map = (layout or World.base_layout(width, height)).copy()
+            cells = base_map.cells
+            if wall_density > 0:
+                for _ in range(int(wall_density * len(cells))):
+                    cells[rng.randrange(len(cells))] = 0
+            cells[start_index] = 1
+            
+            # Ensure at least one path through the map: seal rooms start can't reach.
+            # The pillar layout is connected on its own, so only random walls can cut rooms off
+            open_count = base_map.open_count()
+            if wall_density > 0:
+                base_map = base_map.masked_copy(base_map.connected_mask(start_x, start_y), fill=0)
+                cells = base_map.cells
             
-        base_map[mirror_location[1]][mirror_location[0]] = 5  # Mirror room
+            # Never place anything on the starting room
+            empty_count = cells.count(1) - 1
+            if empty_count >= wanted:
+                break
+        else:
+            raise ValueError(f"Could not lay out a {width}x{height} map with {wanted} reachable special rooms")
+        
+        if report is not None:
+            report['retries'] = attempt
+            report['sealed_rooms'] = open_count - base_map.open_count()
         
-        # Set NPC rooms (6=Therapist, 7=Loved One, 8=Stranger)
-        for i, (x, y) in enumerate(npc_locations):
-            base_map[y][x] = 6 + i  # 6, 7, 8
+        if empty_count < wanted * 4:
+            # Small map: shuffle the candidate indices directly
+            candidates = [i for i, room in enumerate(cells) if room == 1 and i != start_index]
+            chosen = rng.sample(candidates, wanted)
+        else:
+            # Large map: draw random cells until enough distinct empty ones turn up
+            chosen = []
+            seen = set()
+            size = len(cells)
+            while len(chosen) < wanted:
+                i = rng.randrange(size)
+                if i != start_index and cells[i] == 1 and i not in seen:
+                    seen.add(i)
+                    chosen.append(i)
         
+        for index, room_type in zip(chosen, World.SPECIAL_ROOMS):
+            cells[index] = room_type
         return base_map
     
-    def regenerate_map_for_phase(self, game_phase):
+    @staticmethod
+    def generate_many(n, seeds=None, width=5, height=5, wall_density=0.0):
+        """Generate n maps, one per seed (0..n-1 by default), for tests and simulations."""
+        seeds = range(n) if seeds is None else seeds
+        layout = World.base_layout(width, height)
+        return [World.generate_map(width, height, random.Random(seed), layout, wall_density)
+                for seed, _ in zip(seeds, range(n))]
+    
+    def unreachable_special_rooms(self, start=(0, 0)):
+        """List special rooms on the current map that can't be reached from start."""
+        reachable = self.map.connected_mask(*start)
+        cells = self.map.cells
+        return [(i % self.width, i // self.width) for i, room in enumerate(memoryview(cells))
+                if room >= 3 and not reachable[i]]
+    
+    def regenerate_map_for_phase(self, game_phase, start=(0, 0)):
         """Generate a new map when phase changes to ensure challenges in all phases."""
-        new_map = self.generate_emotional_journey_map()
+        if self.endless:
+            # A fresh endless map: new chunk seeds, with the player's room kept open
+            self.map_generation += 1
+            new_map = self._create_chunked_map()
+            new_map.set(start[0], start[1], 1)
+            self.replace_map(new_map)
+            return new_map
         
-        # Keep player's current position clear
-        current_position = (0, 0)  # Default starting position
-        new_map[current_position[1]][current_position[0]] = 1
+        # Keep player's current position clear and connected to every special room
+        new_map = self._store(self.generate_emotional_journey_map(start))
         
-        self.map = new_map
+        self.replace_map(new_map)
         return new_map
     
+    def set_room(self, x, y, room_type):
+        """Change a single room, recording the write for cache invalidation."""
+        old_type = self.map.get(x, y)
+        if old_type == room_type:
+            return
+        self.map.set(x, y, room_type)
+        self.version += 1
+        
+        if self.room_index is not None:
+            if old_type >= 2:
+                self.room_index[old_type].discard((x, y))
+            if room_type >= 2:
+                self.room_index.setdefault(room_type, set()).add((x, y))
+        self._change_log.append((x, y, old_type, room_type))
+        
+        if len(self._change_log) > self.MAX_CHANGE_LOG:
+            # Forget the older half; caches that far behind rebuild instead
+            dropped = len(self._change_log) // 2
+            del self._change_log[:dropped]
+            self._change_log_base += dropped
+    
+    def replace_map(self, new_map):
+        """Swap in a whole new map, invalidating everything derived from the old one."""
+        self.map = new_map
+        self.width = new_map.width
+        self.height = new_map.height
+        self.explored = self._create_explored(new_map)
+        self.room_index = self._index_rooms(new_map)
+        self.version += 1
+        self._change_log = []
+        self._change_log_base = self.version
+    
+    def changes_since(self, version):
+        """Cells written after the given version, or None if they are no longer known."""
+        if version < self._change_log_base:
+            return None
+        return self._change_log[version - self._change_log_base:]
+    
     def get_room_name(self, x, y):
         """Get emotional room names based on room type."""
         room_type = self.map[y][x]
@@ -98,6 +386,10 @@ class World:
             return f"Familiar Presence"
         elif room_type == 8:
             return f"Kindred Spirit"
+        elif room_type == 9:
+            return f"Stairway Down"
+        elif room_type == 10:
+            return f"Stairway Up"
         return "Unknown Place"
     
     def get_room_description(self, x, y):
@@ -118,7 +410,9 @@ class World:
             5: "A mirror stands before you. Do you dare look at yourself?",
             6: "Someone sits here patiently. Their presence feels safe, non-judgmental.",
             7: "A familiar figure waits here. Someone who knows you, who cares for you.",
-            8: "A fellow traveler rests here. Someone who understands the journey."
+            8: "A fellow traveler rests here. Someone who understands the journey.",
+            9: "Worn steps lead further down. The way on isn't always up.",
+            10: "Steps climb back toward where you have already been."
         }
         
         if room_type == 1:
@@ -6,5 +6,10 @@ Custom data structures for the game implementation.
 from .custom_linked_list import LinkedList
 from .custom_stack import Stack
 from .custom_queue import Queue
+from .memory_index import MemoryIndex
+from .memory_timeline import MemoryTimeline
+from .grid import Grid
+from .chunked_grid import ChunkedGrid
+from .mapped_grid import MappedGrid
 
-__all__ = ['LinkedList', 'Stack', 'Queue']
\ No newline at end of file
+__all__ = ['LinkedList', 'Stack', 'Queue', 'MemoryIndex', 'MemoryTimeline', 'Grid', 'ChunkedGrid', 'MappedGrid']
\ No newline at end of file
@@ -0,0 +1,144 @@
+# data_structures/chunked_grid.py
+"""Endless grid split into fixed-size chunks that are created on demand."""
+
+import os
+from collections import OrderedDict
+from data_structures.grid import Grid, DIRECTIONS
+
+class _ChunkedRow:
+    """Row proxy so chunked_grid[y][x] reads and writes like a Grid."""
+    __slots__ = ('grid', 'y')
+
+    def __init__(self, grid, y):
+        self.grid = grid
+        self.y = y
+
+    def __len__(self):
+        return self.grid.width
+
+    def __getitem__(self, x):
+        return self.grid.get(x, self.y)
+
+    def __setitem__(self, x, value):
+        self.grid.set(x, self.y, value)
+
+class ChunkedGrid:
+    """Grid of chunk_size x chunk_size Grid chunks, kept in a bounded LRU.
+
+    Chunks come from generate_chunk(chunk_x, chunk_y) the first time they
+    are touched. Once more than max_resident chunks are in memory the least
+    recently used one is dropped; if it was modified it is first written to
+    spill_dir and read back from there next time. Without a spill_dir,
+    modified chunks stay resident.
+    """
+    def __init__(self, chunk_size, generate_chunk, chunks_per_side=1 << 15,
+                 max_resident=64, spill_dir=None):
+        self.chunk_size = chunk_size
+        self.width = self.height = chunk_size * chunks_per_side
+        self.generate_chunk = generate_chunk
+        self.max_resident = max_resident
+        self.spill_dir = spill_dir
+        self.chunks = OrderedDict()   # (chunk_x, chunk_y) -> Grid, oldest first
+        self.modified = set()         # Chunks changed since they were loaded
+        self.generated = 0
+        self.evictions = 0
+        self.spills = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.height:
+            raise IndexError("grid row out of range")
+        return _ChunkedRow(self, y)
+
+    def _spill_path(self, key):
+        return os.path.join(self.spill_dir, f"chunk_{key[0]}_{key[1]}.bin")
+
+    def chunk(self, chunk_x, chunk_y):
+        """Return a chunk, loading or generating it if it isn't resident."""
+        key = (chunk_x, chunk_y)
+        grid = self.chunks.get(key)
+        if grid is not None:
+            self.chunks.move_to_end(key)
+            return grid
+
+        if self.spill_dir and os.path.exists(self._spill_path(key)):
+            grid = Grid(self.chunk_size, self.chunk_size)
+            with open(self._spill_path(key), 'rb') as f:
+                grid.cells[:] = f.read()
+        else:
+            grid = self.generate_chunk(chunk_x, chunk_y)
+            self.generated += 1
+        self.chunks[key] = grid
+        self._evict()
+        return grid
+
+    def _evict(self):
+        """Drop least recently used chunks until within max_resident."""
+        for key in list(self.chunks):
+            if len(self.chunks) <= self.max_resident:
+                break
+            if key in self.modified:
+                if not self.spill_dir:
+                    continue  # Nowhere to keep the changes; leave it resident
+                self._spill(key)
+            del self.chunks[key]
+            self.evictions += 1
+
+    def _spill(self, key):
+        """Write a modified chunk to disk."""
+        with open(self._spill_path(key), 'wb') as f:
+            f.write(self.chunks[key].cells)
+        self.modified.discard(key)
+        self.spills += 1
+
+    def flush(self):
+        """Write every modified resident chunk to disk."""
+        if self.spill_dir:
+            for key in list(self.modified):
+                self._spill(key)
+
+    def in_bounds(self, x, y):
+        """Check if a coordinate lies on the grid."""
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def is_open(self, x, y):
+        """Check if a coordinate is on the grid and not a wall."""
+        return self.in_bounds(x, y) and self.get(x, y) != 0
+
+    def get(self, x, y):
+        """Room type at a coordinate."""
+        size = self.chunk_size
+        return self.chunk(x // size, y // size).cells[(y % size) * size + x % size]
+
+    def set(self, x, y, value):
+        """Change the room type at a coordinate."""
+        size = self.chunk_size
+        self.chunk(x // size, y // size).cells[(y % size) * size + x % size] = value
+        self.modified.add((x // size, y // size))
+
+    def neighbours(self, x, y):
+        """Yield the open cells orthogonally adjacent to a coordinate."""
+        for dx, dy in DIRECTIONS:
+            if self.is_open(x + dx, y + dy):
+                yield x + dx, y + dy
+
+    def window(self, left, top, width, height, fill=0):
+        """Copy a rectangle into a plain Grid; cells off the grid get fill."""
+        size = self.chunk_size
+        window = Grid(width, height, fill)
+        for y in range(max(top, 0), min(top + height, self.height)):
+            row_start = (y - top) * width
+            x = max(left, 0)
+            right = min(left + width, self.width)
+            while x < right:
+                chunk = self.chunk(x // size, y // size)
+                chunk_end = min(right, (x // size + 1) * size)
+                offset = (y % size) * size + x % size
+                piece = chunk.cells[offset:offset + chunk_end - x]
+                window.cells[row_start + x - left:row_start + chunk_end - left] = piece
+                x = chunk_end
+        return window
@@ -2,61 +2,74 @@
 """Linked list implementation for memory tracking (Week 4)."""
 
 class Node:
-    """Node for the linked list, holding data and a reference to the next node."""
+    """Node for the linked list, holding data and references to its neighbours."""
+    __slots__ = ('data', 'next', 'prev')
+
     def __init__(self, data):
         self.data = data
         self.next = None
+        self.prev = None
 
 class LinkedList:
     """Linked list for storing memories (Week 4)."""
     def __init__(self):
         self.head = None
+        self.tail = None  # Kept so append doesn't walk the whole chain
         self.size = 0
-    
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        """Walk memories from oldest to newest."""
+        current = self.head
+        while current:
+            yield current.data
+            current = current.next
+
+    def __reversed__(self):
+        """Walk memories from newest to oldest."""
+        current = self.tail
+        while current:
+            yield current.data
+            current = current.prev
+
     def append(self, data):
         """Add a memory to the end of the list."""
         new_node = Node(data)
         if not self.head:
             self.head = new_node
         else:
-            current = self.head
-            while current.next:
-                current = current.next
-            current.next = new_node
+            new_node.prev = self.tail
+            self.tail.next = new_node
+        self.tail = new_node
         self.size += 1
-    
+
     def prepend(self, data):
         """Add a memory to the start of the list."""
         new_node = Node(data)
         new_node.next = self.head
+        if self.head:
+            self.head.prev = new_node
+        else:
+            self.tail = new_node
         self.head = new_node
         self.size += 1
-    
+
     def get_recent(self, n=5):
-        """Retrieve the n most recent memories."""
+        """Retrieve the n most recent memories, newest first."""
         result = []
-        current = self.head
-        while current and len(result) < n:
-            result.append(current.data)
-            current = current.next
+        for data in reversed(self):
+            if len(result) >= n:
+                break
+            result.append(data)
         return result
-    
+
     def find_by_keyword(self, keyword):
         """Search memories containing the keyword (case-insensitive)."""
-        results = []
-        current = self.head
         keyword = keyword.lower()
-        while current:
-            if keyword in current.data.get('text', '').lower():
-                results.append(current.data)
-            current = current.next
-        return results
-    
+        return [data for data in self if keyword in data.get('text', '').lower()]
+
     def display_all(self):
         """Return all memories in the list."""
-        memories = []
-        current = self.head
-        while current:
-            memories.append(current.data)
-            current = current.next
-        return memories
\ No newline at end of file
+        return list(self)
\ No newline at end of file
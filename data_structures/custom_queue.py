@@ -1,35 +1,69 @@
 # data_structures/custom_queue.py
 """Queue implementation for event management (Week 5)."""
 
+import heapq
+from collections import deque
+from itertools import count
+
 class Queue:
-    """Priority queue for turn-based events."""
+    """Priority queue for turn-based events.
+    
+    Events with equal priority come out in the order they went in. While
+    every queued event shares one priority the queue is a plain FIFO; a
+    binary heap keyed on (priority, sequence) takes over once they differ.
+    """
     def __init__(self):
-        self.items = []
+        self._fifo = deque()
+        self._heap = []
+        self._counter = count()  # Monotonic sequence for stable tie-breaking
     
-    def enqueue(self, item, priority=2):
-        """Add an event with a priority (1=high, 2=medium, 3=low)."""
+    def __len__(self):
+        return len(self._fifo) + len(self._heap)
+    
+    def _wrap(self, item, priority):
+        """Build the (priority, sequence, event) entry stored internally."""
         # Ensure item has a priority field
         item_with_priority = item.copy() if isinstance(item, dict) else {'data': item}
         item_with_priority['priority'] = priority
-        
-        # Insert into sorted position based on priority
-        i = 0
-        while i < len(self.items) and self.items[i]['priority'] <= priority:
-            i += 1
-        self.items.insert(i, item_with_priority)
+        return (priority, next(self._counter), item_with_priority)
+    
+    def _push(self, entry):
+        """Route an entry to the FIFO fast path or the heap."""
+        if not self._heap and (not self._fifo or self._fifo[0][0] == entry[0]):
+            self._fifo.append(entry)
+            return
+        if self._fifo:
+            # Priorities diverged: fold the FIFO run into the heap
+            self._heap.extend(self._fifo)
+            self._fifo.clear()
+            heapq.heapify(self._heap)
+        heapq.heappush(self._heap, entry)
+    
+    def enqueue(self, item, priority=2):
+        """Add an event with a priority (1=high, 2=medium, 3=low)."""
+        self._push(self._wrap(item, priority))
+    
+    def enqueue_many(self, items, priority=2):
+        """Add several events sharing one priority."""
+        for item in items:
+            self._push(self._wrap(item, priority))
     
     def dequeue(self):
         """Remove and return the highest-priority event."""
-        if self.is_empty():
-            return None
-        return self.items.pop(0)
+        if self._fifo:
+            return self._fifo.popleft()[2]
+        if self._heap:
+            return heapq.heappop(self._heap)[2]
+        return None
     
     def peek(self):
         """View the highest-priority event without removing it."""
-        if self.is_empty():
-            return None
-        return self.items[0]
+        if self._fifo:
+            return self._fifo[0][2]
+        if self._heap:
+            return self._heap[0][2]
+        return None
     
     def is_empty(self):
         """Check if the queue is empty."""
-        return len(self.items) == 0
\ No newline at end of file
+        return not self._fifo and not self._heap
@@ -1,31 +1,91 @@
 # data_structures/custom_stack.py
 """Stack implementation for move history (Week 5)."""
 
+from array import array
+
 class Stack:
-    """Stack for tracking move history with a max size of 10."""
-    def __init__(self, max_size=10):
-        self.items = []
+    """Bounded stack for tracking move history, with a default max size of 10.
+    
+    Moves live in a fixed-size circular buffer, so pushing onto a full stack
+    overwrites the oldest move instead of shifting every entry. Passing an
+    array typecode (e.g. 'b' or 'h') stores (x, y) coordinate pairs in a
+    compact array rather than as Python tuples.
+    """
+    def __init__(self, max_size=10, typecode=None):
         self.max_size = max_size
+        self.typecode = typecode
+        if typecode:
+            self._buffer = array(typecode, [0]) * (max_size * 2)
+        else:
+            self._buffer = [None] * max_size
+        self._start = 0  # Index of the oldest move
+        self._count = 0
+    
+    def __len__(self):
+        return self._count
+    
+    def _slot(self, offset):
+        """Buffer index of the move `offset` places after the oldest one."""
+        return (self._start + offset) % self.max_size
+    
+    def _read(self, index):
+        if self.typecode:
+            return (self._buffer[index * 2], self._buffer[index * 2 + 1])
+        return self._buffer[index]
+    
+    def _write(self, index, item):
+        if self.typecode:
+            self._buffer[index * 2], self._buffer[index * 2 + 1] = item
+        else:
+            self._buffer[index] = item
     
     def push(self, item):
         """Add a move to the stack, removing oldest if at max size."""
-        if len(self.items) >= self.max_size:
-            self.items.pop(0)  # Remove oldest move
-        self.items.append(item)
+        if self._count >= self.max_size:
+            # Overwrite the oldest move in place
+            self._write(self._start, item)
+            self._start = self._slot(1)
+        else:
+            self._write(self._slot(self._count), item)
+            self._count += 1
         return "Move recorded."
     
     def pop(self):
         """Remove and return the most recent move."""
         if self.is_empty():
             return None, "No moves to undo."
-        return self.items.pop(), "Move undone."
+        self._count -= 1
+        index = self._slot(self._count)
+        item = self._read(index)
+        if not self.typecode:
+            self._buffer[index] = None
+        return item, "Move undone."
     
     def peek(self):
         """View the most recent move without removing it."""
         if self.is_empty():
             return None
-        return self.items[-1]
+        return self._read(self._slot(self._count - 1))
     
     def is_empty(self):
         """Check if the stack is empty."""
-        return len(self.items) == 0
\ No newline at end of file
+        return self._count == 0
+    
+    def clear(self):
+        """Forget every recorded move."""
+        self._start = 0
+        self._count = 0
+    
+    def iter_moves(self):
+        """Yield recorded moves from oldest to newest."""
+        for offset in range(self._count):
+            yield self._read(self._slot(offset))
+    
+    def to_list(self):
+        """Serialise moves, oldest first, as JSON-friendly lists."""
+        return [list(move) if isinstance(move, tuple) else move for move in self.iter_moves()]
+    
+    @property
+    def items(self):
+        """Recorded moves, oldest first."""
+        return list(self.iter_moves())
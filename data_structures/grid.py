@@ -0,0 +1,160 @@
+# data_structures/grid.py
+"""Compact 2D grid for the dungeon map."""
+
+import re
+
+# Marker for cells the player hasn't seen yet in a fog-of-war grid
+UNKNOWN = 255
+
+# North, South, East, West
+DIRECTIONS = [(0, -1), (0, 1), (1, 0), (-1, 0)]
+
+# Runs of consecutive non-wall cells within a row
+_OPEN_RUN = re.compile(rb'[^\x00]+')
+
+# Byte table turning a 0/1 mask into 0x00/0xFF
+_MASK_TABLE = bytes([0]) + bytes([255]) * 255
+
+class Grid:
+    """Width x height matrix of room types stored in a single bytearray.
+
+    Rows are exposed as memoryview slices, so existing grid[y][x] reads and
+    writes keep working while the cells stay one byte each.
+    """
+    def __init__(self, width, height, fill=0):
+        self.width = width
+        self.height = height
+        self.cells = bytearray([fill]) * (width * height)
+        self._view = memoryview(self.cells)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a grid from a list of equal-length rows."""
+        grid = cls(len(rows[0]) if rows else 0, len(rows))
+        for y, row in enumerate(rows):
+            grid.cells[y * grid.width:(y + 1) * grid.width] = bytes(row)
+        return grid
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.height:
+            raise IndexError("grid row out of range")
+        return self._view[y * self.width:(y + 1) * self.width]
+
+    def __iter__(self):
+        for y in range(self.height):
+            yield self[y]
+
+    def in_bounds(self, x, y):
+        """Check if a coordinate lies on the grid."""
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def is_open(self, x, y):
+        """Check if a coordinate is on the grid and not a wall."""
+        return 0 <= x < self.width and 0 <= y < self.height and self.cells[y * self.width + x] != 0
+
+    def get(self, x, y):
+        """Room type at a coordinate."""
+        return self.cells[y * self.width + x]
+
+    def set(self, x, y, value):
+        """Change the room type at a coordinate."""
+        self.cells[y * self.width + x] = value
+
+    def open_count(self):
+        """Number of cells that are not walls."""
+        return len(self.cells) - self.cells.count(0)
+
+    def neighbours(self, x, y):
+        """Yield the open cells orthogonally adjacent to a coordinate."""
+        for dx, dy in DIRECTIONS:
+            if self.is_open(x + dx, y + dy):
+                yield x + dx, y + dy
+
+    def positions_of(self, value):
+        """Yield every coordinate holding the given room type."""
+        start = self.cells.find(value)
+        while start != -1:
+            yield start % self.width, start // self.width
+            start = self.cells.find(value, start + 1)
+
+    def connected_mask(self, x, y):
+        """Return a bytearray with 1 for every open cell connected to (x, y).
+
+        Each row is split into runs of open cells, and runs that overlap a
+        run in the row above are merged with union-find. The work is one
+        pass over the rows, with the run scanning done by the regex engine.
+        """
+        width, height = self.width, self.height
+        mask = bytearray(width * height)
+        if not self.is_open(x, y):
+            return mask
+
+        cells = bytes(self.cells)
+        start = y * width + x
+        parent = []
+        runs = []        # (first_index, end_index) of each run
+        start_run = None
+
+        def find(run):
+            while parent[run] != run:
+                parent[run] = parent[parent[run]]
+                run = parent[run]
+            return run
+
+        previous = []
+        for row in range(height):
+            row_start = row * width
+            current = []
+            for match in _OPEN_RUN.finditer(cells, row_start, row_start + width):
+                run = len(runs)
+                runs.append((match.start(), match.end()))
+                parent.append(run)
+                current.append((match.start() - row_start, match.end() - row_start, run))
+                if match.start() <= start < match.end():
+                    start_run = run
+
+            # Merge with overlapping runs in the row above
+            i = j = 0
+            while i < len(previous) and j < len(current):
+                above_start, above_end, above = previous[i]
+                here_start, here_end, here = current[j]
+                if above_start < here_end and here_start < above_end:
+                    root_above, root_here = find(above), find(here)
+                    if root_above != root_here:
+                        parent[root_here] = root_above
+                if above_end < here_end:
+                    i += 1
+                else:
+                    j += 1
+            previous = current
+
+        root = find(start_run)
+        for run, (first, end) in enumerate(runs):
+            if find(run) == root:
+                mask[first:end] = b'\x01' * (end - first)
+        return mask
+
+    def masked_copy(self, mask, fill=UNKNOWN):
+        """Copy of the grid keeping cells where mask is set and using fill elsewhere."""
+        size = len(self.cells)
+        # Combine whole byte strings as big integers rather than looping per cell
+        keep = int.from_bytes(bytes(mask).translate(_MASK_TABLE), 'little')
+        cells = int.from_bytes(self.cells, 'little')
+        filler = int.from_bytes(bytes([fill]) * size, 'little')
+
+        grid = Grid(self.width, self.height)
+        grid.cells[:] = ((cells & keep) | (filler & ~keep)).to_bytes(size, 'little')
+        return grid
+
+    def copy(self):
+        """Return an independent copy of the grid."""
+        grid = Grid(self.width, self.height)
+        grid.cells[:] = self.cells
+        return grid
+
+    def to_rows(self):
+        """Return the grid as nested lists (for JSON saves)."""
+        return [list(self.cells[y * self.width:(y + 1) * self.width]) for y in range(self.height)]
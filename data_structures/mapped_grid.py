@@ -0,0 +1,61 @@
+# data_structures/mapped_grid.py
+"""Grid whose cells live in a memory-mapped file."""
+
+import mmap
+import zlib
+from data_structures.grid import Grid
+
+class MappedGrid(Grid):
+    """Grid backed by a file of width * height room-type bytes.
+
+    The cells are an mmap of the file, so writes such as clearing a room
+    land in the file directly and a save only needs the path and a checksum.
+    """
+    COUNT_SLICE = 1 << 20
+
+    def __init__(self, path, width, height):
+        self.path = path
+        self.width = width
+        self.height = height
+        with open(path, 'r+b') as f:
+            if f.seek(0, 2) != width * height:
+                raise ValueError(f"Map file {path} does not hold a {width}x{height} map")
+            # The mapping stays valid after the file object is closed
+            self.cells = mmap.mmap(f.fileno(), width * height)
+        self._view = memoryview(self.cells)
+
+    @classmethod
+    def create(cls, path, grid):
+        """Write a grid's cells to path and map the new file."""
+        with open(path, 'wb') as f:
+            f.write(grid.cells)
+        return cls(path, grid.width, grid.height)
+
+    def positions_of(self, value):
+        """Yield every coordinate holding the given room type."""
+        # mmap.find only accepts bytes, unlike bytearray.find
+        needle = bytes([value])
+        start = self.cells.find(needle)
+        while start != -1:
+            yield start % self.width, start // self.width
+            start = self.cells.find(needle, start + 1)
+
+    def open_count(self):
+        """Number of cells that are not walls."""
+        # mmap has no count(), so count a slice at a time instead of copying the whole file
+        size = len(self.cells)
+        walls = sum(self.cells[start:start + self.COUNT_SLICE].count(0)
+                    for start in range(0, size, self.COUNT_SLICE))
+        return size - walls
+
+    def load(self, grid):
+        """Overwrite every cell with those of a same-sized grid."""
+        self.cells[:] = grid.cells
+
+    def checksum(self):
+        """CRC32 of the cells, to tell whether the file changed since a save."""
+        return zlib.crc32(self.cells)
+
+    def flush(self):
+        """Make sure every write so far has reached the file."""
+        self.cells.flush()
@@ -0,0 +1,118 @@
+# data_structures/memory_index.py
+"""Inverted keyword index over the memory journal."""
+
+import bisect
+import heapq
+import re
+from array import array
+
+class MemoryIndex:
+    """Maps each word in a memory's text to the ids of memories containing it.
+    
+    Memory ids are assigned in journal order, so every posting list is an
+    ascending array of ids and the newest matches sit at its end. Without
+    max_postings the index grows with the journal. Passing it caps each
+    list, keeping only the most recent ids for very common words, so a
+    search for such a word no longer finds its older memories. The
+    vocabulary is never capped.
+    """
+    TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+    
+    def __init__(self, max_postings=None):
+        self.max_postings = max_postings
+        self.postings = {}     # token -> array of memory ids
+        self.vocabulary = []   # Sorted tokens, for prefix lookups
+        self.entries = []      # memory id -> memory dict
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    @classmethod
+    def tokenize(cls, text):
+        """Split text into unique lowercase word tokens."""
+        return set(cls.TOKEN_PATTERN.findall(text.lower()))
+    
+    def add(self, memory):
+        """Index a memory and return its id."""
+        memory_id = len(self.entries)
+        self.entries.append(memory)
+        
+        for token in self.tokenize(memory.get('text', '')):
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = array('L')
+                bisect.insort(self.vocabulary, token)
+            posting.append(memory_id)
+            if self.max_postings and len(posting) > self.max_postings:
+                del posting[0]
+        return memory_id
+    
+    def _matching_ids(self, term, prefix):
+        """Ids of memories containing the term (or any word starting with it)."""
+        term = term.lower()
+        if not prefix:
+            return set(self.postings.get(term, ()))
+        
+        ids = set()
+        start = bisect.bisect_left(self.vocabulary, term)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            ids.update(self.postings[token])
+        return ids
+    
+    def search(self, terms, mode='and', prefix=False, rank='recency', limit=None):
+        """Find memories matching the terms.
+        
+        mode is 'and' (every term) or 'or' (any term); rank is 'recency'
+        (newest first) or 'hope' (largest hope_gained first, then newest).
+        """
+        if isinstance(terms, str):
+            terms = terms.split()
+        if not terms:
+            return []
+        
+        id_sets = sorted((self._matching_ids(term, prefix) for term in terms), key=len)
+        if mode == 'and':
+            ids = id_sets[0]
+            for other in id_sets[1:]:
+                ids = ids & other
+        else:
+            ids = set().union(*id_sets)
+        return self._ranked(self.entries, ids, rank, limit)
+    
+    @classmethod
+    def scan(cls, memories, terms, mode='and', prefix=False, rank='recency', limit=None):
+        """Search a journal without an index, with the same matching and ranking as search."""
+        if isinstance(terms, str):
+            terms = terms.split()
+        if not terms:
+            return []
+        
+        terms = [term.lower() for term in terms]
+        entries = list(memories)
+        test = all if mode == 'and' else any
+        ids = []
+        for memory_id, memory in enumerate(entries):
+            tokens = cls.tokenize(memory.get('text', ''))
+            if prefix:
+                found = test(any(token.startswith(term) for token in tokens) for term in terms)
+            else:
+                found = test(term in tokens for term in terms)
+            if found:
+                ids.append(memory_id)
+        return cls._ranked(entries, ids, rank, limit)
+    
+    @staticmethod
+    def _ranked(entries, ids, rank, limit):
+        """Memories for the ids, newest first or by hope_gained, cut to limit."""
+        if rank == 'hope':
+            key = lambda i: (entries[i].get('hope_gained', 0), i)
+        else:
+            key = None
+        
+        if limit is not None:
+            ordered = heapq.nlargest(limit, ids, key=key)
+        else:
+            ordered = sorted(ids, key=key, reverse=True)
+        return [entries[i] for i in ordered]
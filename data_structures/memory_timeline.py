@@ -0,0 +1,63 @@
+# data_structures/memory_timeline.py
+"""Sorted timestamp arrays for time-range queries over memories."""
+
+import bisect
+from array import array
+
+class MemoryTimeline:
+    """Memories ordered by numeric timestamp, with running hope totals.
+    
+    times[i] is the epoch time of entries[i] and hope_totals[i] is the hope
+    gained by every memory before it, so range lookups and window sums are
+    binary searches rather than scans of the journal.
+    """
+    def __init__(self):
+        self.times = array('d')
+        self.hope_totals = array('d', [0.0])
+        self.entries = []
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def add(self, memory, timestamp):
+        """Record a memory at the given epoch time."""
+        if self.times and timestamp < self.times[-1]:
+            # The clock went backwards; keep journal order instead
+            timestamp = self.times[-1]
+        self.times.append(timestamp)
+        self.entries.append(memory)
+        self.hope_totals.append(self.hope_totals[-1] + memory.get('hope_gained', 0))
+    
+    def between(self, start, end):
+        """Memories recorded in [start, end], oldest first."""
+        lo = bisect.bisect_left(self.times, start)
+        hi = bisect.bisect_right(self.times, end)
+        return self.entries[lo:hi]
+    
+    def since(self, start):
+        """Memories recorded at or after start, oldest first."""
+        return self.entries[bisect.bisect_left(self.times, start):]
+    
+    def hope_between(self, start, end):
+        """Total hope gained by memories recorded in [start, end]."""
+        lo = bisect.bisect_left(self.times, start)
+        hi = bisect.bisect_right(self.times, end)
+        return self.hope_totals[hi] - self.hope_totals[lo]
+    
+    def hope_by_window(self, windows):
+        """Split the journal's time span into equal windows and sum hope in each."""
+        if not self.entries or windows < 1:
+            return []
+        first, last = self.times[0], self.times[-1]
+        width = (last - first) / windows
+        
+        gains = []
+        lo = 0
+        for i in range(1, windows + 1):
+            if i == windows:
+                hi = len(self.times)
+            else:
+                hi = bisect.bisect_left(self.times, first + width * i, lo)
+            gains.append(self.hope_totals[hi] - self.hope_totals[lo])
+            lo = hi
+        return gains
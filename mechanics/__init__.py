@@ -6,5 +6,8 @@ Game mechanics - Systems for movement, battle, and pathfinding.
 from .battle_system import BattleSystem
 from .commands import CommandProcessor
 from .pathfinding import PathFinder
+from .path_cache import PathCache
+from .route_planner import RoutePlanner
+from .minimap import Minimap
 
-__all__ = ['BattleSystem', 'CommandProcessor', 'PathFinder']
\ No newline at end of file
+__all__ = ['BattleSystem', 'CommandProcessor', 'PathFinder', 'PathCache', 'RoutePlanner', 'Minimap']
\ No newline at end of file
@@ -213,7 +213,7 @@ class BattleSystem:
         
         # Clear demon from room
         x, y = self.player.position
-        self.game.world.map[y][x] = 1
+        self.game.world.set_room(x, y, 1)
         self.player.face_demon(self.game)
     
     def defeat(self, demon):
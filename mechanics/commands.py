@@ -6,18 +6,26 @@ import random
 from content.items import Items
 from content.dialogues import Dialogues
 from mechanics.battle_system import BattleSystem
+from mechanics.pathfinding import PathFinder
 from utils.display import Display
 from utils.save_system import SaveSystem
 
 class CommandProcessor:
     """Process player commands with simplified controls."""
     
+    DIRECTION_OFFSETS = {'up': (0, -1), 'down': (0, 1), 'right': (1, 0), 'left': (-1, 0)}
+    OFFSET_DIRECTIONS = dict(zip(DIRECTION_OFFSETS.values(), DIRECTION_OFFSETS))
+    
+    # Travel menu keys and the room groups they head for
+    TRAVEL_TARGETS = {'i': 'items', 'm': 'mirrors', 'n': 'npcs'}
+    
     def __init__(self, game_state):
         self.game = game_state
     
     def process_input(self):
         """Get and process player input."""
         Display.print_hint("Use arrow keys to move or type a key command")
+        Display.end_frame()  # The hint closes the frame, so nothing is printed after it
         
         key = readchar.readkey()
         
@@ -50,21 +58,22 @@ class CommandProcessor:
             self.show_help()
         elif key.lower() == 'x':
             self.examine_mirror()
+        elif key in ('>', '<'):
+            self.take_stairs()
+        elif key.lower() == 'r':
+            self.plan_route()
+        elif key.lower() == 'g':
+            self.travel()
+        elif key.lower() == 'o':
+            self.toggle_minimap()
     
     def is_valid_move(self, direction):
         """Check if a move is valid."""
         x, y = self.game.player.position
-        
-        if direction == 'up' and y > 0 and self.game.world.map[y-1][x] != 0:
-            return True
-        if direction == 'down' and y < 4 and self.game.world.map[y+1][x] != 0:
-            return True
-        if direction == 'right' and x < 4 and self.game.world.map[y][x+1] != 0:
-            return True
-        if direction == 'left' and x > 0 and self.game.world.map[y][x-1] != 0:
-            return True
-        
-        return False
+        if direction not in self.DIRECTION_OFFSETS:
+            return False
+        dx, dy = self.DIRECTION_OFFSETS[direction]
+        return self.game.world.map.is_open(x + dx, y + dy)
     
     def move(self, direction):
         """Move in a specified direction."""
@@ -73,16 +82,8 @@ class CommandProcessor:
             return
             
         x, y = self.game.player.position
-        new_x, new_y = x, y
-        
-        if direction == 'up':
-            new_y -= 1
-        elif direction == 'down':
-            new_y += 1
-        elif direction == 'right':
-            new_x += 1
-        elif direction == 'left':
-            new_x -= 1
+        dx, dy = self.DIRECTION_OFFSETS[direction]
+        new_x, new_y = x + dx, y + dy
         
         # Save current position for undo
         self.game.move_history.push((x, y))
@@ -115,6 +116,81 @@ class CommandProcessor:
             elif event_type == 'encouragement':
                 self.game.event_queue.enqueue({'type': 'encouragement'})
     
+    def toggle_minimap(self):
+        """Show or hide the overview of maps bigger than the screen."""
+        if self.game.world.endless:
+            Display.print_message("The dungeon stretches on too far for an overview.")
+            return
+        if not self.game.map_exceeds_viewport():
+            Display.print_message("The whole map already fits on screen.")
+            return
+        self.game.show_minimap = not self.game.show_minimap
+    
+    def travel(self):
+        """Pick a destination and walk there in one go."""
+        Display.print_hint("Travel to the nearest i = item, m = mirror, n = person, or c = x,y")
+        key = readchar.readkey().lower()
+        
+        if key in self.TRAVEL_TARGETS:
+            path = self.find_route(self.TRAVEL_TARGETS[key])
+        elif key == 'c':
+            try:
+                goal_x, goal_y = (int(part) for part in input("Enter x,y: ").split(','))
+            except ValueError:
+                Display.print_message("Those aren't coordinates")
+                return
+            path = self.find_route((goal_x, goal_y))
+        else:
+            return
+        
+        if not path:
+            Display.print_message("You can't find a way there")
+            return
+        if len(path) == 1:
+            Display.print_message("You're already there.")
+            return
+        
+        steps = self.follow_path(path)
+        Display.print_message(f"You walk {steps} step{'s' if steps != 1 else ''}.")
+    
+    def find_route(self, target):
+        """Path from the player to the nearest room of a group ('items', ...) or to an (x, y)."""
+        x, y = self.game.player.position
+        world = self.game.world
+        
+        if world.endless:
+            # Only the rooms around the player exist, so search within a window
+            window, (left, top) = world.window_around(x, y, self.game.VIEW_RADIUS)
+            pathfinder = PathFinder(window)
+            if isinstance(target, str):
+                path = pathfinder.find_nearest(x - left, y - top, target)
+            elif window.in_bounds(target[0] - left, target[1] - top):
+                path = pathfinder.find_path_to_hope(x - left, y - top, target[0] - left, target[1] - top)
+            else:
+                path = None
+            return [(step_x + left, step_y + top) for step_x, step_y in path] if path else None
+        
+        if isinstance(target, str):
+            return self.game.path_cache.find_nearest(x, y, target)
+        if not world.map.in_bounds(*target):
+            return None
+        return self.game.path_cache.find_path(x, y, *target)
+    
+    def follow_path(self, path):
+        """Walk along a path, stopping early as soon as an event is queued.
+        
+        Every step goes through move(), so undo history and random events
+        work as usual; the screen is only redrawn once the walk is over.
+        Returns the number of steps taken.
+        """
+        steps = 0
+        for (x, y), (next_x, next_y) in zip(path, path[1:]):
+            self.move(self.OFFSET_DIRECTIONS[(next_x - x, next_y - y)])
+            steps += 1
+            if not self.game.event_queue.is_empty():
+                break
+        return steps
+    
     def move_up(self):
         """Move up."""
         self.move('up')
@@ -166,6 +242,13 @@ class CommandProcessor:
             Display.print_message("A fellow traveler on their own journey. There's understanding in their eyes.")
             Display.print_hint("Press 'k' to share experiences")
         
+        if not self.game.world.endless:
+            demons_left = self.game.world.count_rooms(3)
+            if demons_left == 1:
+                Display.print_message("One inner demon still waits somewhere in the dungeon.")
+            elif demons_left:
+                Display.print_message(f"{demons_left} inner demons still wait somewhere in the dungeon.")
+        
         Display.pause()
     
     def inventory(self):
@@ -201,7 +284,7 @@ class CommandProcessor:
         self.game.player.gain_item(item, self.game)
         
         # Mark room as cleared
-        self.game.world.map[y][x] = 1
+        self.game.world.set_room(x, y, 1)
         
         Display.print_message(f"You gained: {item['name']}")
         if item['type'] == 'hope':
@@ -306,7 +389,7 @@ class CommandProcessor:
         self.game.npcs_visited += 1
         
         # Mark room as normal after conversation (NPC moves on)
-        self.game.world.map[y][x] = 1
+        self.game.world.set_room(x, y, 1)
         
         Display.pause()
     
@@ -336,6 +419,45 @@ class CommandProcessor:
         
         Display.pause()
     
+    def take_stairs(self):
+        """Go up or down the stairs in the current room."""
+        x, y = self.game.player.position
+        room_type = self.game.world.map[y][x]
+        
+        if not self.game.dungeon or room_type not in (9, 10):
+            Display.print_message("There are no stairs here")
+            return
+        
+        floor, position = self.game.dungeon.take_stairs(x, y)
+        self.game.enter_floor(position)
+        
+        direction = "down" if room_type == 9 else "up"
+        Display.print_message(f"You take the stairs {direction} to floor {floor + 1} of {self.game.dungeon.floor_count}.")
+    
+    def plan_route(self):
+        """Show the best order to visit the remaining items, mirrors and people."""
+        x, y = self.game.player.position
+        
+        Display.clear_screen()
+        Display.print_centered_title("THE WAY AHEAD")
+        
+        if self.game.world.endless:
+            Display.print_message("The dungeon stretches on too far to plan a route.")
+            Display.pause()
+            return
+        
+        plan = self.game.route_planner.plan(x, y, self.game.game_phase)
+        if not plan['order']:
+            Display.print_message("There is nothing left to seek here. Only your demons remain.")
+        else:
+            for i, (room_x, room_y) in enumerate(plan['order'], 1):
+                print(f"{i}. {self.game.world.get_room_name(room_x, room_y)} [{room_x},{room_y}]")
+            Display.print_message(f"{plan['steps']} steps in all, with about {round(plan['hope'])} hope along the way.")
+            if not plan['exact']:
+                Display.print_hint("There are many places to visit, so this route is a close estimate.")
+        
+        Display.pause()
+    
     def show_help(self):
         """Show game help and controls."""
         Display.clear_screen()
@@ -0,0 +1,63 @@
+# mechanics/minimap.py
+"""Coarse overview of the fog-of-war view, kept up to date block by block."""
+
+from data_structures.grid import UNKNOWN
+
+# What a block can show, lowest first; a block shows the highest level among its rooms
+UNSEEN, WALL, OPEN, SPECIAL, DEMON = range(5)
+
+def _level(room_type):
+    if room_type == UNKNOWN:
+        return UNSEEN
+    if room_type == 0:
+        return WALL
+    if room_type == 1:
+        return OPEN
+    return DEMON if room_type == 3 else SPECIAL
+
+# Level of each room type, as a translate table
+LEVELS = bytes(_level(room_type) for room_type in range(256))
+
+class Minimap:
+    """Per-block counts of each level over a revealed map.
+
+    The counts are built with one pass over the map. After that every
+    revealed room that changes adjusts the counts of its own block, so
+    drawing the overview costs one lookup per block, however big the map.
+    """
+    def __init__(self, revealed_map, size=(20, 8)):
+        self.size = size
+        self.width = width = revealed_map.width
+        self.height = height = revealed_map.height
+        columns, rows = size
+        self.block = block = max(-(-width // columns), -(-height // rows), 1)
+        self.columns = -(-width // block)
+        self.rows = -(-height // block)
+        self.counts = [[0] * 5 for _ in range(self.columns * self.rows)]
+
+        levels = bytes(revealed_map.cells).translate(LEVELS)
+        for y in range(height):
+            row = levels[y * width:(y + 1) * width]
+            first = (y // block) * self.columns
+            for column in range(self.columns):
+                piece = row[column * block:(column + 1) * block]
+                counts = self.counts[first + column]
+                for level in range(5):
+                    counts[level] += piece.count(level)
+
+    def update(self, index, old_type, new_type):
+        """Account for the revealed room at a cell index changing type."""
+        old, new = LEVELS[old_type], LEVELS[new_type]
+        if old != new:
+            x, y = index % self.width, index // self.width
+            counts = self.counts[(y // self.block) * self.columns + x // self.block]
+            counts[old] -= 1
+            counts[new] += 1
+
+    def level(self, column, row):
+        """Highest level among the rooms of a block."""
+        counts = self.counts[row * self.columns + column]
+        for level in (DEMON, SPECIAL, OPEN, WALL):
+            if counts[level]:
+                return level
+        return UNSEEN
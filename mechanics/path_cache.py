@@ -0,0 +1,226 @@
+# mechanics/path_cache.py
+"""Cache of pathfinding results that follows changes to the world map."""
+
+from collections import OrderedDict
+from data_structures.grid import UNKNOWN
+from mechanics.pathfinding import PathFinder, ROOM_GROUPS
+from mechanics.minimap import Minimap
+
+class PathCache:
+    """Remembers distance fields, reachability and the fog-of-war view for a World.
+    
+    Results are tied to the world's version counter. When only a few rooms
+    have changed since the last lookup, cached results are patched from the
+    world's change log; anything the changes could have invalidated is
+    dropped and rebuilt on demand.
+    """
+    MAX_VIEWS = 64  # Fields of view remembered, least recently used dropped first
+    
+    def __init__(self, world, all_pairs_threshold=None):
+        self.world = world
+        self.version = world.version
+        self.all_pairs_threshold = all_pairs_threshold
+        self.all_pairs = None    # AllPairsTable, or False when the map is too big
+        self.fields = {}         # frozenset of room types -> DistanceField
+        self.reachability = []   # Reachable-cell masks, one per connected region
+        self.revealed = None     # Fog-of-war view over the world's explored rooms
+        self.overview = None     # Minimap of the revealed view, built on first use
+        self.views = OrderedDict()  # (x, y, radius) -> visible cell indices, oldest first
+        self.hits = 0
+        self.misses = 0
+        self.repairs = 0
+    
+    @property
+    def pathfinder(self):
+        return PathFinder(self.world.map, self.all_pairs or None)
+    
+    def stats(self):
+        """Hit, miss and repair counts, for checking the cache is pulling its weight."""
+        return {'hits': self.hits, 'misses': self.misses, 'repairs': self.repairs,
+                'version': self.version,
+                'all_pairs_bytes': self.all_pairs.memory_usage() if self.all_pairs else 0}
+    
+    def clear(self):
+        """Drop every cached result."""
+        self.fields.clear()
+        self.reachability.clear()
+        self.revealed = None
+        self.overview = None
+        self.views.clear()
+        self.all_pairs = None
+    
+    def _sync(self):
+        """Bring cached results up to the world's current version."""
+        if self.version == self.world.version:
+            return
+        
+        changes = self.world.changes_since(self.version)
+        if changes is None:
+            self.clear()
+        else:
+            for change in changes:
+                self._repair(*change)
+        self.version = self.world.version
+    
+    def _repair(self, x, y, old_type, new_type):
+        """Patch cached results after a single room changed type."""
+        wall_changed = (old_type == 0) != (new_type == 0)
+        if wall_changed:
+            # Walls reshape every route and region
+            self.fields.clear()
+            self.reachability.clear()
+            self.all_pairs = None
+            # Only views whose radius covers the room can be affected
+            for key in list(self.views):
+                view_x, view_y, radius = key
+                if abs(view_x - x) <= radius and abs(view_y - y) <= radius:
+                    del self.views[key]
+        
+        for room_types in list(self.fields):
+            was_target = old_type in room_types
+            is_target = new_type in room_types
+            if was_target and not is_target:
+                del self.fields[room_types]
+            elif is_target and not was_target:
+                self.pathfinder.extend_distance_field(self.fields[room_types], x, y)
+                self.repairs += 1
+        
+        if self.revealed is not None and self.revealed.get(x, y) != UNKNOWN:
+            self.revealed.set(x, y, new_type)
+            if self.overview is not None:
+                self.overview.update(y * self.revealed.width + x, old_type, new_type)
+            self.repairs += 1
+    
+    def distance_field(self, room_types):
+        """Cached PathFinder.distance_field."""
+        if isinstance(room_types, str):
+            room_types = ROOM_GROUPS[room_types]
+        key = frozenset(room_types)
+        
+        self._sync()
+        field = self.fields.get(key)
+        if field is not None:
+            self.hits += 1
+            return field
+        
+        self.misses += 1
+        if self.world.room_index is None:
+            field = self.pathfinder.distance_field(key)
+        else:
+            # Targets come from the world's room index rather than a scan of the map
+            targets = [pos for room_type in key for pos in self.world.rooms_of_type(room_type)]
+            field = self.pathfinder.distance_field_to(targets)
+        self.fields[key] = field
+        return field
+    
+    def all_pairs_table(self):
+        """Cached all-pairs table, or None when the map is over the size threshold."""
+        self._sync()
+        if self.all_pairs is None:
+            self.misses += 1
+            self.all_pairs = self.pathfinder.all_pairs_table(self.all_pairs_threshold) or False
+        else:
+            self.hits += 1
+        return self.all_pairs or None
+    
+    def find_path(self, start_x, start_y, goal_x, goal_y):
+        """Shortest path between two rooms, from the all-pairs table when the map is small."""
+        table = self.all_pairs_table()
+        if table is not None:
+            return table.path(start_x, start_y, goal_x, goal_y)
+        return self.pathfinder.find_path_to_hope(start_x, start_y, goal_x, goal_y)
+    
+    def find_nearest(self, start_x, start_y, room_types):
+        """Shortest path to the nearest room of the given type(s)."""
+        if not self.world.map.is_open(start_x, start_y):
+            return None
+        return self.distance_field(room_types).path_from(start_x, start_y)
+    
+    def reachable_cells(self, start_x, start_y):
+        """Cached PathFinder.reachable_cells."""
+        self._sync()
+        start = start_y * self.world.map.width + start_x
+        for mask in self.reachability:
+            if mask[start]:
+                self.hits += 1
+                return mask
+        
+        self.misses += 1
+        mask = self.pathfinder.reachable_cells(start_x, start_y)
+        if mask[start]:
+            self.reachability.append(mask)
+        return mask
+    
+    def is_reachable(self, start_x, start_y, goal_x, goal_y):
+        """Check whether one position can be walked to from another."""
+        mask = self.reachable_cells(start_x, start_y)
+        return bool(mask[goal_y * self.world.map.width + goal_x])
+    
+    def field_of_view(self, x, y, radius):
+        """Cached PathFinder.field_of_view.
+        
+        Only walls block sight, so views survive room changes that don't
+        add or remove a wall within their radius.
+        """
+        self._sync()
+        key = (x, y, radius)
+        visible = self.views.get(key)
+        if visible is not None:
+            self.hits += 1
+            self.views.move_to_end(key)
+            return visible
+        
+        self.misses += 1
+        visible = self.views[key] = self.pathfinder.field_of_view(x, y, radius)
+        if len(self.views) > self.MAX_VIEWS:
+            self.views.popitem(last=False)
+        return visible
+    
+    def reveal_fog_of_war(self, start_x, start_y, radius=1):
+        """Fog-of-war view with the rooms in sight of a position newly explored.
+        
+        The view persists between calls, so each move only copies the
+        visible rooms instead of rebuilding the whole grid.
+        """
+        visible = self.field_of_view(start_x, start_y, radius)
+        explored = self.world.explored
+        if self.revealed is None:
+            self.revealed = self.pathfinder.reveal_fog_of_war(start_x, start_y, radius, explored, visible)
+            return self.revealed
+        
+        cells = self.world.map.cells
+        revealed = self.revealed.cells
+        overview = self.overview
+        for index in visible:
+            explored[index] = 1
+            if overview is not None and revealed[index] != cells[index]:
+                overview.update(index, revealed[index], cells[index])
+            revealed[index] = cells[index]
+        return self.revealed
+    
+    def minimap(self, size=(20, 8)):
+        """Minimap of the fog-of-war view, kept current as rooms are revealed or change."""
+        if self.overview is None or self.overview.size != size:
+            self.overview = Minimap(self.revealed, size)
+        return self.overview
+    
+    def reveal_window(self, center_x, center_y, view_radius, radius=1):
+        """Fog-of-war view of the rooms around a position, for maps too big to reveal whole.
+        
+        Returns (revealed Grid, (left, top)), where the Grid covers
+        view_radius rooms around the position and (left, top) is its corner
+        in world coordinates. Newly seen rooms are recorded in the world's
+        explored bitmap.
+        """
+        world_map, (left, top) = self.world.window_around(center_x, center_y, view_radius)
+        seen, _ = self.world.window_around(center_x, center_y, view_radius, layer='explored')
+        
+        pathfinder = PathFinder(world_map)
+        visible = pathfinder.field_of_view(center_x - left, center_y - top, radius)
+        revealed = pathfinder.reveal_fog_of_war(center_x - left, center_y - top, radius, seen.cells, visible)
+        
+        # Copy the newly seen rooms back into the world's bitmap
+        size = world_map.width
+        for index in visible:
+            self.world.mark_explored(left + index % size, top + index // size)
+        return revealed, (left, top)
@@ -1,78 +1,466 @@
 # mechanics/pathfinding.py
-"""Pathfinding implementation using recursion (Week 2)."""
+"""Pathfinding and fog-of-war for navigating the dungeon (Week 2)."""
 
-from data_structures.custom_queue import Queue
+import heapq
+from array import array
+from collections import deque
+from math import ceil, sqrt
+from data_structures.grid import Grid, UNKNOWN, DIRECTIONS
+
+# Room types grouped by what the player is looking for
+ROOM_GROUPS = {
+    'demons': (3,),
+    'items': (4,),
+    'mirrors': (5,),
+    'npcs': (6, 7, 8)
+}
+
+# Cost of stepping into each room type for weighted routes (walls are never entered)
+ROUTE_COSTS = {
+    # Every room costs the same, so A* finds the fewest steps
+    'shortest': {},
+    # Steer around demons and prefer passing through helpful rooms
+    'safest': {1: 2, 3: 40, 4: 1, 5: 1, 6: 1, 7: 1, 8: 1}
+}
+
+# (xx, xy, yx, yy) turning octant-local (column, row) offsets into map offsets
+OCTANTS = [(1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+           (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1)]
+
+class DistanceField:
+    """Distance from every cell to the nearest of a set of target rooms.
+    
+    Built by one multi-source BFS. For each reachable cell it stores the
+    step count, the neighbouring cell one step closer, and which target it
+    leads to, so nearest-target lookups are O(1).
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        size = width * height
+        self.distance = array('i', [-1]) * size
+        self.toward = array('i', [-1]) * size  # Next cell on the way to the target
+        self.target = array('i', [-1]) * size  # Target cell this one leads to
+    
+    def distance_from(self, x, y):
+        """Steps to the nearest target, or None if none is reachable."""
+        steps = self.distance[y * self.width + x]
+        return steps if steps >= 0 else None
+    
+    def next_step(self, x, y):
+        """Neighbouring coordinate one step closer to the nearest target."""
+        index = self.toward[y * self.width + x]
+        if index < 0:
+            return None
+        return index % self.width, index // self.width
+    
+    def nearest_target(self, x, y):
+        """Coordinate of the nearest target, or None if none is reachable."""
+        index = self.target[y * self.width + x]
+        if index < 0:
+            return None
+        return index % self.width, index // self.width
+    
+    def path_from(self, x, y):
+        """Shortest path from a coordinate to its nearest target."""
+        index = y * self.width + x
+        if self.distance[index] < 0:
+            return None
+        path = [index]
+        while self.distance[path[-1]] > 0:
+            path.append(self.toward[path[-1]])
+        return [(i % self.width, i // self.width) for i in path]
+
+class AllPairsTable:
+    """Shortest distances and next hops between every pair of open rooms.
+    
+    Open rooms are numbered 0..n-1 and both tables are flat n*n arrays, so
+    memory grows with the square of the open-room count; only worth
+    building for small dungeons.
+    """
+    UNREACHABLE = 0xFFFF
+    
+    def __init__(self, width, open_cells):
+        self.width = width
+        self.open_cells = open_cells              # room id -> cell index
+        self.room_ids = {index: room_id for room_id, index in enumerate(open_cells)}
+        size = len(open_cells)
+        self.distance = array('H', [self.UNREACHABLE]) * (size * size)
+        self.next_hop = array('H', [self.UNREACHABLE]) * (size * size)
+    
+    def memory_usage(self):
+        """Approximate bytes held by the distance and next-hop tables."""
+        return (self.distance.itemsize * len(self.distance)
+                + self.next_hop.itemsize * len(self.next_hop))
+    
+    def _pair(self, start_x, start_y, goal_x, goal_y):
+        start = self.room_ids.get(start_y * self.width + start_x)
+        goal = self.room_ids.get(goal_y * self.width + goal_x)
+        if start is None or goal is None:
+            return None
+        return start * len(self.open_cells) + goal, goal
+    
+    def distance_between(self, start_x, start_y, goal_x, goal_y):
+        """Steps between two rooms, or None if there is no route."""
+        pair = self._pair(start_x, start_y, goal_x, goal_y)
+        if pair is None or self.distance[pair[0]] == self.UNREACHABLE:
+            return None
+        return self.distance[pair[0]]
+    
+    def path(self, start_x, start_y, goal_x, goal_y):
+        """Walk next hops from start to goal and return the path."""
+        pair = self._pair(start_x, start_y, goal_x, goal_y)
+        if pair is None or self.distance[pair[0]] == self.UNREACHABLE:
+            return None
+        
+        size = len(self.open_cells)
+        current = pair[0] // size
+        goal = pair[1]
+        rooms = [current]
+        while current != goal:
+            current = self.next_hop[current * size + goal]
+            rooms.append(current)
+        return [(self.open_cells[r] % self.width, self.open_cells[r] // self.width) for r in rooms]
 
 class PathFinder:
     """Pathfinding for navigating the dungeon."""
     
-    def __init__(self, world_map):
+    ALL_PAIRS_THRESHOLD = 400  # Most open rooms an all-pairs table is built for
+    
+    def __init__(self, world_map, all_pairs=None):
         self.map = world_map
+        self.all_pairs = all_pairs  # Optional AllPairsTable for instant lookups
     
     def is_valid_position(self, x, y):
         """Check if position is valid and not a wall."""
-        return 0 <= x < 5 and 0 <= y < 5 and self.map[y][x] != 0
+        return self.map.is_open(x, y)
     
     def find_path_to_hope(self, start_x, start_y, hope_x, hope_y):
         """Find shortest path to hope using BFS."""
         if not (self.is_valid_position(start_x, start_y) and self.is_valid_position(hope_x, hope_y)):
             return None
+        if self.all_pairs is not None:
+            return self.all_pairs.path(start_x, start_y, hope_x, hope_y)
         
-        queue = Queue()
-        queue.enqueue(((start_x, start_y), [(start_x, start_y)]), priority=1)
-        visited = {(start_x, start_y)}
+        width, height = self.map.width, self.map.height
+        cells = self.map.cells
+        start = start_y * width + start_x
+        goal = hope_y * width + hope_x
         
-        directions = [(0, -1), (0, 1), (1, 0), (-1, 0)]  # North, South, East, West
+        # Each visited cell remembers the cell it was reached from
+        came_from = array('i', [-1]) * (width * height)
+        came_from[start] = start
+        frontier = deque([start])
         
-        while not queue.is_empty():
-            item = queue.dequeue()
-            if not item:
-                return None
-                
-            (x, y), path = item['data']
+        while frontier:
+            index = frontier.popleft()
+            if index == goal:
+                return self._reconstruct_path(came_from, start, goal)
             
-            if x == hope_x and y == hope_y:
-                return path
-                
-            for dx, dy in directions:
+            x, y = index % width, index // width
+            for dx, dy in DIRECTIONS:
                 new_x, new_y = x + dx, y + dy
-                if self.is_valid_position(new_x, new_y) and (new_x, new_y) not in visited:
-                    visited.add((new_x, new_y))
-                    queue.enqueue(((new_x, new_y), path + [(new_x, new_y)]), priority=1)
+                if 0 <= new_x < width and 0 <= new_y < height:
+                    neighbour = new_y * width + new_x
+                    if came_from[neighbour] == -1 and cells[neighbour] != 0:
+                        came_from[neighbour] = index
+                        frontier.append(neighbour)
         
         return None
     
-    def find_nearest_healing(self, start_x, start_y):
-        """Find nearest healing location (item room)."""
-        healing_locations = [(x, y) for y in range(5) for x in range(5) if self.map[y][x] == 4]
+    def find_path_astar(self, start_x, start_y, goal_x, goal_y, mode='shortest', costs=None):
+        """Find the cheapest path using A* with a Manhattan heuristic.
         
-        shortest_path = None
-        shortest_distance = float('inf')
+        mode picks a cost table from ROUTE_COSTS ('shortest' or 'safest');
+        costs overrides it with a {room_type: cost} dict, where unlisted
+        rooms cost 1.
+        """
+        if not (self.is_valid_position(start_x, start_y) and self.is_valid_position(goal_x, goal_y)):
+            return None
         
-        for x, y in healing_locations:
-            path = self.find_path_to_hope(start_x, start_y, x, y)
-            if path and len(path) < shortest_distance:
-                shortest_distance = len(path)
-                shortest_path = path
+        table = ROUTE_COSTS[mode] if costs is None else costs
+        step_cost = [table.get(room_type, 1) for room_type in range(256)]
+        # Scaling the heuristic by the cheapest step keeps it admissible
+        min_cost = min(min(table.values(), default=1), 1)
         
-        return shortest_path
-    
-    def reveal_fog_of_war(self, start_x, start_y, radius=1):
-        """Reveal map within radius using recursion."""
-        revealed = [[-1 for _ in range(5)] for _ in range(5)]
+        width, height = self.map.width, self.map.height
+        cells = self.map.cells
+        start = start_y * width + start_x
+        goal = goal_y * width + goal_x
         
-        def reveal(x, y, r):
-            """Recursive function to reveal map."""
-            if not (0 <= x < 5 and 0 <= y < 5) or r < 0:
-                return
+        g_score = array('l', [-1]) * (width * height)
+        came_from = array('i', [-1]) * (width * height)
+        g_score[start] = 0
+        came_from[start] = start
+        # Entries are (f, h, g, cell); ties go to the cell closest to the goal
+        open_set = [(0, 0, 0, start)]
+        
+        while open_set:
+            f, h, g, index = heapq.heappop(open_set)
+            if index == goal:
+                return self._reconstruct_path(came_from, start, goal)
+            if g > g_score[index]:
+                continue  # Stale entry; a cheaper route was already found
             
-            revealed[y][x] = self.map[y][x]
+            x, y = index % width, index // width
+            for dx, dy in DIRECTIONS:
+                new_x, new_y = x + dx, y + dy
+                if 0 <= new_x < width and 0 <= new_y < height:
+                    neighbour = new_y * width + new_x
+                    room_type = cells[neighbour]
+                    if room_type == 0:
+                        continue
+                    new_g = g + step_cost[room_type]
+                    if g_score[neighbour] == -1 or new_g < g_score[neighbour]:
+                        g_score[neighbour] = new_g
+                        came_from[neighbour] = index
+                        h = (abs(goal_x - new_x) + abs(goal_y - new_y)) * min_cost
+                        heapq.heappush(open_set, (new_g + h, h, new_g, neighbour))
+        
+        return None
+    
+    def path_cost(self, path, mode='shortest', costs=None):
+        """Total cost of walking a path (excluding the starting room)."""
+        table = ROUTE_COSTS[mode] if costs is None else costs
+        return sum(table.get(self.map.get(x, y), 1) for x, y in path[1:])
+    
+    def _reconstruct_path(self, came_from, start, goal):
+        """Walk predecessor links back from goal and return the path as coordinates."""
+        width = self.map.width
+        path = [goal]
+        while path[-1] != start:
+            path.append(came_from[path[-1]])
+        path.reverse()
+        return [(index % width, index // width) for index in path]
+    
+    def distance_field(self, room_types):
+        """Build a DistanceField to every room whose type is in room_types."""
+        if isinstance(room_types, str):
+            room_types = ROOM_GROUPS[room_types]
+        
+        targets = []
+        for room_type in set(room_types):
+            targets.extend(self.map.positions_of(room_type))
+        return self.distance_field_to(targets)
+    
+    def distance_field_to(self, targets):
+        """Build a DistanceField to a list of target coordinates."""
+        width, height = self.map.width, self.map.height
+        cells = self.map.cells
+        field = DistanceField(width, height)
+        distance, toward, target = field.distance, field.toward, field.target
+        
+        # Seed the frontier with every target at once
+        frontier = deque()
+        for x, y in targets:
+            index = y * width + x
+            if cells[index] == 0 or distance[index] == 0:
+                continue
+            distance[index] = 0
+            toward[index] = index
+            target[index] = index
+            frontier.append(index)
+        
+        while frontier:
+            index = frontier.popleft()
+            x, y = index % width, index // width
+            steps = distance[index] + 1
+            for dx, dy in DIRECTIONS:
+                new_x, new_y = x + dx, y + dy
+                if 0 <= new_x < width and 0 <= new_y < height:
+                    neighbour = new_y * width + new_x
+                    if distance[neighbour] == -1 and cells[neighbour] != 0:
+                        distance[neighbour] = steps
+                        toward[neighbour] = index
+                        target[neighbour] = target[index]
+                        frontier.append(neighbour)
+        
+        return field
+    
+    def extend_distance_field(self, field, target_x, target_y):
+        """Add a new target room to an existing field, relaxing only cells it brings closer."""
+        width, height = self.map.width, self.map.height
+        cells = self.map.cells
+        distance, toward, target = field.distance, field.toward, field.target
+        
+        start = target_y * width + target_x
+        distance[start] = 0
+        toward[start] = start
+        target[start] = start
+        frontier = deque([start])
+        
+        while frontier:
+            index = frontier.popleft()
+            x, y = index % width, index // width
+            steps = distance[index] + 1
+            for dx, dy in DIRECTIONS:
+                new_x, new_y = x + dx, y + dy
+                if 0 <= new_x < width and 0 <= new_y < height:
+                    neighbour = new_y * width + new_x
+                    if cells[neighbour] != 0 and (distance[neighbour] == -1 or distance[neighbour] > steps):
+                        distance[neighbour] = steps
+                        toward[neighbour] = index
+                        target[neighbour] = start
+                        frontier.append(neighbour)
+        return field
+    
+    def reachable_cells(self, start_x, start_y):
+        """Return a bytearray mask of the cells reachable from a position."""
+        return self.map.connected_mask(start_x, start_y)
+    
+    def find_paths(self, requests):
+        """Find shortest paths for many (start, goal) pairs, sharing work between them.
+        
+        Pairs are grouped by goal and each distinct goal gets one reverse
+        BFS, so the cost grows with the number of goals rather than agents.
+        Yields (request_index, path) lazily, one goal group at a time, with
+        path None when the goal can't be reached.
+        """
+        by_goal = {}
+        for request_index, (start, goal) in enumerate(requests):
+            by_goal.setdefault(tuple(goal), []).append((request_index, start))
+        
+        for goal, group in by_goal.items():
+            if not self.is_valid_position(*goal):
+                for request_index, start in group:
+                    yield request_index, None
+                continue
             
-            if r == 0:
-                return
-                
-            for dx, dy in [(0, -1), (0, 1), (1, 0), (-1, 0)]:
-                reveal(x + dx, y + dy, r - 1)
-        
-        reveal(start_x, start_y, radius)
-        return revealed
\ No newline at end of file
+            field = self.distance_field_to([goal])
+            for request_index, (start_x, start_y) in group:
+                if not self.is_valid_position(start_x, start_y):
+                    yield request_index, None
+                else:
+                    yield request_index, field.path_from(start_x, start_y)
+    
+    def all_pairs_table(self, threshold=None):
+        """Precompute an AllPairsTable, or return None if the map has too many open rooms."""
+        threshold = self.ALL_PAIRS_THRESHOLD if threshold is None else threshold
+        threshold = min(threshold, AllPairsTable.UNREACHABLE - 1)  # Room ids must fit the table
+        cells = self.map.cells
+        if self.map.open_count() > threshold:
+            return None
+        
+        width, height = self.map.width, self.map.height
+        # A memoryview yields ints for an mmap too, where iterating the mmap yields bytes
+        open_cells = [index for index, room in enumerate(memoryview(cells)) if room != 0]
+        table = AllPairsTable(width, open_cells)
+        size = len(open_cells)
+        room_ids = table.room_ids
+        distance, next_hop = table.distance, table.next_hop
+        
+        # BFS from each goal; a room's BFS parent is its next hop toward that goal
+        for goal in range(size):
+            steps = {open_cells[goal]: 0}
+            distance[goal * size + goal] = 0
+            next_hop[goal * size + goal] = goal
+            frontier = deque([open_cells[goal]])
+            while frontier:
+                index = frontier.popleft()
+                x, y = index % width, index // width
+                for dx, dy in DIRECTIONS:
+                    new_x, new_y = x + dx, y + dy
+                    if 0 <= new_x < width and 0 <= new_y < height:
+                        neighbour = new_y * width + new_x
+                        if cells[neighbour] != 0 and neighbour not in steps:
+                            steps[neighbour] = steps[index] + 1
+                            pair = room_ids[neighbour] * size + goal
+                            distance[pair] = steps[neighbour]
+                            next_hop[pair] = room_ids[index]
+                            frontier.append(neighbour)
+        return table
+    
+    def find_nearest(self, start_x, start_y, room_types):
+        """Find the shortest path to the nearest room of the given type(s)."""
+        if not self.is_valid_position(start_x, start_y):
+            return None
+        return self.distance_field(room_types).path_from(start_x, start_y)
+    
+    def find_nearest_healing(self, start_x, start_y):
+        """Find nearest healing location (item room)."""
+        return self.find_nearest(start_x, start_y, 'items')
+    
+    def field_of_view(self, center_x, center_y, radius):
+        """Set of cell indices visible from a position within a circular radius.
+        
+        Recursive shadowcasting, run with an explicit stack of (row, start
+        slope, end slope) wedges per octant instead of Python recursion.
+        Walls are seen but block what lies behind them.
+        """
+        width, height = self.map.width, self.map.height
+        cells = self.map.cells
+        center = center_y * width + center_x
+        visible = {center}
+        see = visible.add
+        near_edge = not (radius <= center_x < width - radius and radius <= center_y < height - radius)
+        # Furthest column inside the radius on each row
+        reach = [int(sqrt(radius * radius - row * row)) for row in range(radius + 1)]
+        
+        for xx, xy, yx, yy in OCTANTS:
+            col_step = -(xx + yx * width)
+            row_step = -(xy + yy * width)
+            # Slopes are column / row; each wedge is still open between start and end
+            pending = [(1, 1.0, 0.0)]
+            while pending:
+                row, start, end = pending.pop()
+                if start < end:
+                    continue  # Wedges pushed at a wall can cover no angle at all
+                for depth in range(row, radius + 1):
+                    far, near = depth + 0.5, depth - 0.5
+                    # Columns whose cells overlap the wedge on this row
+                    high = int(start * far + 0.5)
+                    if high > depth:
+                        high = depth
+                    low = ceil(end * near - 0.5) if end > 0 else 0
+                    blocked = False
+                    row_index = center + depth * row_step
+                    limit = reach[depth]
+                    for column in range(high, low - 1, -1):
+                        index = row_index + column * col_step
+                        if not near_edge:
+                            if column <= limit:
+                                see(index)
+                            opaque = cells[index] == 0
+                        else:
+                            # Off-map cells block sight like walls
+                            x = center_x - column * xx - depth * xy
+                            y = center_y - column * yx - depth * yy
+                            opaque = not (0 <= x < width and 0 <= y < height) or cells[index] == 0
+                            if column <= limit and 0 <= x < width and 0 <= y < height:
+                                see(index)
+                        
+                        if blocked:
+                            if opaque:
+                                new_start = (column - 0.5) / far
+                            else:
+                                # Leaving a run of walls: the wedge reopens here
+                                blocked = False
+                                start = new_start
+                        elif opaque and depth < radius:
+                            # Entering a run of walls: scan past it later as its own wedge
+                            blocked = True
+                            pending.append((depth + 1, start, (column + 0.5) / near))
+                            new_start = (column - 0.5) / far
+                    if blocked:
+                        break
+        return visible
+    
+    def reveal_fog_of_war(self, start_x, start_y, radius=1, explored=None, visible=None):
+        """Reveal the rooms in line of sight within a radius of a position.
+        
+        visible can pass in an already computed field_of_view. If an
+        explored bitmap is given, the newly seen cells are marked in it and
+        everything seen before stays revealed.
+        """
+        if visible is None:
+            visible = self.field_of_view(start_x, start_y, radius)
+        cells = self.map.cells
+        if explored is not None:
+            for index in visible:
+                explored[index] = 1
+            return self.map.masked_copy(explored)
+        
+        revealed = Grid(self.map.width, self.map.height, fill=UNKNOWN)
+        for index in visible:
+            revealed.cells[index] = cells[index]
+        return revealed
@@ -0,0 +1,170 @@
+# mechanics/route_planner.py
+"""Plan the best order to visit the special rooms left on the map."""
+
+from operator import add
+from content.items import Items
+from mechanics.pathfinding import PathFinder
+
+# Hope granted by a mirror in each phase (see CommandProcessor.examine_mirror)
+MIRROR_HOPE = {'rock_bottom': 5, 'struggle': 7, 'realization': 8, 'growth': 10, 'glory': 15}
+
+# Hope granted by an NPC in each phase (see CommandProcessor.talk_to_npc)
+NPC_HOPE = {'rock_bottom': 5, 'struggle': 7, 'realization': 9, 'growth': 11, 'glory': 13}
+LOVED_ONE_BONUS = 3
+
+# Average hope from a random item; items of other types add nothing to hope
+ITEM_HOPE = sum(item['value'] for item in Items.ITEMS.values() if item['type'] == 'hope') / len(Items.ITEMS)
+
+class RoutePlanner:
+    """Finds the shortest order to visit the remaining items, mirrors and NPCs.
+
+    Walking distances come from one BFS per target. Up to EXACT_LIMIT
+    targets the order is solved exactly with Held-Karp dynamic programming
+    over subsets; beyond that a nearest-neighbour tour is improved with
+    2-opt. Plans are remembered per map version and position.
+    """
+    EXACT_LIMIT = 16
+    ROOM_TYPES = (4, 5, 6, 7, 8)
+
+    def __init__(self, world):
+        self.world = world
+        self.version = world.version
+        self.plans = {}  # (x, y, phase, room_types) -> plan for the current map version
+
+    @staticmethod
+    def expected_hope(room_type, phase):
+        """Hope the player can expect from visiting a room of the given type."""
+        if room_type == 4:
+            return ITEM_HOPE
+        if room_type == 5:
+            return MIRROR_HOPE.get(phase, 5)
+        if room_type in (6, 7, 8):
+            return NPC_HOPE.get(phase, 5) + (LOVED_ONE_BONUS if room_type == 7 else 0)
+        return 0
+
+    def plan(self, start_x, start_y, phase='rock_bottom', room_types=ROOM_TYPES):
+        """Best visiting order from a position.
+
+        Returns a dict with the 'order' of coordinates to visit, total
+        'steps', expected 'hope' gained, whether the order is 'exact', and
+        the 'unreachable' targets that were left out.
+        """
+        if self.version != self.world.version:
+            self.plans.clear()
+            self.version = self.world.version
+        key = (start_x, start_y, phase, tuple(room_types))
+        plan = self.plans.get(key)
+        if plan is None:
+            plan = self.plans[key] = self._plan(start_x, start_y, phase, room_types)
+        return plan
+
+    def _plan(self, start_x, start_y, phase, room_types):
+        targets = sorted(position for room_type in room_types
+                         for position in self.world.rooms_of_type(room_type))
+
+        # One BFS per target gives its distance to the start and every other target
+        pathfinder = PathFinder(self.world.map)
+        reachable, start_costs, fields = [], [], []
+        for target in targets:
+            field = pathfinder.distance_field_to([target])
+            steps = field.distance_from(start_x, start_y)
+            if steps is not None:
+                reachable.append(target)
+                start_costs.append(steps)
+                fields.append(field)
+        distances = [[field.distance_from(*other) for other in reachable] for field in fields]
+
+        if len(reachable) <= self.EXACT_LIMIT:
+            steps, order = self.held_karp(start_costs, distances)
+        else:
+            steps, order = self.nearest_neighbour_two_opt(start_costs, distances)
+
+        order = [reachable[i] for i in order]
+        return {
+            'order': order,
+            'steps': steps,
+            'hope': sum(self.expected_hope(self.world.map.get(x, y), phase) for x, y in order),
+            'exact': len(reachable) <= self.EXACT_LIMIT,
+            'unreachable': [target for target in targets if target not in reachable]
+        }
+
+    @staticmethod
+    def held_karp(start_costs, distances):
+        """Exact shortest walk from the start through every target.
+
+        best[mask][last] is the shortest walk that visits the targets in
+        mask and ends at last. Returns (steps, order of target indices).
+        """
+        count = len(start_costs)
+        if count == 0:
+            return 0, []
+        infinity = float('inf')
+        # columns[last][j] is the distance from target j to target last
+        columns = [[distances[j][last] for j in range(count)] for last in range(count)]
+
+        best = [None] * (1 << count)
+        for mask in range(1, 1 << count):
+            row = [infinity] * count
+            if mask & (mask - 1) == 0:
+                last = mask.bit_length() - 1
+                row[last] = start_costs[last]
+            else:
+                remaining = mask
+                while remaining:
+                    bit = remaining & -remaining
+                    remaining ^= bit
+                    last = bit.bit_length() - 1
+                    # Targets outside mask ^ bit are infinite, so min only picks real predecessors
+                    row[last] = min(map(add, best[mask ^ bit], columns[last]))
+            best[mask] = row
+
+        # Walk back from the cheapest end to recover the order
+        mask = (1 << count) - 1
+        last = min(range(count), key=best[mask].__getitem__)
+        steps = best[mask][last]
+        order = [last]
+        while mask & (mask - 1):
+            previous = mask ^ (1 << last)
+            row = best[previous]
+            last = min((j for j in range(count) if previous >> j & 1),
+                       key=lambda j: row[j] + distances[j][last])
+            order.append(last)
+            mask = previous
+        order.reverse()
+        return steps, order
+
+    @staticmethod
+    def nearest_neighbour_two_opt(start_costs, distances):
+        """Approximate walk: always go to the closest target, then untangle with 2-opt."""
+        count = len(start_costs)
+        order = []
+        remaining = set(range(count))
+        costs = start_costs
+        while remaining:
+            nearest = min(remaining, key=costs.__getitem__)
+            order.append(nearest)
+            remaining.discard(nearest)
+            costs = distances[nearest]
+
+        def leg(a, b):
+            # a is None for the start; b is None past the end, which costs nothing
+            if b is None:
+                return 0
+            return start_costs[b] if a is None else distances[a][b]
+
+        # Reversing order[i:j + 1] only changes the two legs at its ends
+        improved = True
+        while improved:
+            improved = False
+            for i in range(count - 1):
+                before = order[i - 1] if i else None
+                for j in range(i + 1, count):
+                    after = order[j + 1] if j + 1 < count else None
+                    old = leg(before, order[i]) + leg(order[j], after)
+                    new = leg(before, order[j]) + leg(order[i], after)
+                    if new < old:
+                        order[i:j + 1] = order[i:j + 1][::-1]
+                        improved = True
+
+        steps = start_costs[order[0]] + sum(distances[a][b] for a, b in zip(order, order[1:])) if order else 0
+        return steps, order
@@ -0,0 +1,29 @@
+# tests/test_field_of_view.py
+"""Tests for PathFinder.field_of_view."""
+
+import unittest
+from data_structures.grid import Grid
+from mechanics.pathfinding import PathFinder
+
+class FieldOfViewTest(unittest.TestCase):
+    """Line of sight must stop at walls."""
+
+    def test_wall_column_blocks_sight(self):
+        grid = Grid(40, 40, 1)
+        for y in range(40):
+            grid.set(20, y, 0)
+        visible = PathFinder(grid).field_of_view(15, 20, 15)
+        behind = sorted((index % 40, index // 40) for index in visible if index % 40 > 20)
+        self.assertEqual(behind, [])
+        # The wall itself is seen
+        self.assertIn(20 * 40 + 20, visible)
+
+    def test_open_room_is_a_disc(self):
+        grid = Grid(21, 21, 1)
+        visible = PathFinder(grid).field_of_view(10, 10, 5)
+        expected = {y * 21 + x for y in range(21) for x in range(21)
+                    if (x - 10) ** 2 + (y - 10) ** 2 <= 25}
+        self.assertEqual(visible, expected)
+
+if __name__ == '__main__':
+    unittest.main()
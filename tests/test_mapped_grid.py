@@ -0,0 +1,39 @@
+# tests/test_mapped_grid.py
+"""Tests for MappedGrid standing in for a Grid."""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from core.world import World
+from data_structures.mapped_grid import MappedGrid
+from mechanics.pathfinding import PathFinder
+
+class MappedGridTest(unittest.TestCase):
+    """A mapped map must work wherever the in-memory map does."""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.grid = World.generate_map(12, 12, random.Random(3), wall_density=0.2)
+        self.mapped = MappedGrid.create(os.path.join(self.folder, 'map.bin'), self.grid)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_open_count_matches_grid(self):
+        self.assertEqual(self.mapped.open_count(), self.grid.open_count())
+
+    def test_all_pairs_table(self):
+        expected = PathFinder(self.grid).all_pairs_table()
+        table = PathFinder(self.mapped).all_pairs_table()
+        self.assertIsNotNone(table)
+        self.assertEqual(table.distance, expected.distance)
+
+    def test_unreachable_special_rooms(self):
+        world = World(12, 12, seed=3, map_file=os.path.join(self.folder, 'world.bin'))
+        self.assertIsInstance(world.map, MappedGrid)
+        self.assertEqual(world.unreachable_special_rooms(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+# tests/test_memory_search.py
+"""Tests for Player.search_memories with and without the keyword index."""
+
+import unittest
+from core.player import Player
+
+MEMORIES = [
+    ("A voice said keep going", 2),
+    ("Going home at last", 0),
+    ("The voice in the lighthouse", 5),
+    ("Nothing at all", 1),
+]
+
+class MemorySearchTest(unittest.TestCase):
+    """The same search must find the same memories whether or not the journal is indexed."""
+
+    def setUp(self):
+        self.indexed = Player()
+        self.scanned = Player(index_memories=False)
+        for text, hope in MEMORIES:
+            self.indexed.add_memory(text, hope)
+            self.scanned.add_memory(text, hope)
+
+    def search_both(self, *args, **kwargs):
+        found = []
+        for player in (self.indexed, self.scanned):
+            found.append([memory['text'] for memory in player.search_memories(*args, **kwargs)])
+        self.assertEqual(found[0], found[1])
+        return found[0]
+
+    def test_and_matches_every_term(self):
+        self.assertEqual(self.search_both(['voice', 'going']), ["A voice said keep going"])
+
+    def test_or_matches_any_term(self):
+        self.assertEqual(self.search_both(['voice', 'going'], mode='or'),
+                         ["The voice in the lighthouse", "Going home at last", "A voice said keep going"])
+
+    def test_prefix_and_hope_rank(self):
+        self.assertEqual(self.search_both('li', prefix=True, rank='hope'),
+                         ["The voice in the lighthouse"])
+        self.assertEqual(self.search_both('vo', prefix=True, rank='hope', limit=1),
+                         ["The voice in the lighthouse"])
+
+    def test_whole_words_only(self):
+        self.assertEqual(self.search_both('go'), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,28 @@
 # utils/display.py
 """Display utilities for the game."""
 
+import io
+import re
 import time
 import sys
 import os
 from colorama import init, Fore, Style, Back
+from data_structures.grid import UNKNOWN
 
 # Initialize colorama
 init(autoreset=True)
 
+class FrameBuffer(io.StringIO):
+    """StringIO that counts how many writes went into it."""
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+        self.screen = False  # Set when the frame replaces the whole screen
+    
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
 class Display:
     """Display utilities for the game UI."""
     
@@ -27,44 +41,144 @@ class Display:
     
     _text_speed = 0.03  # Default delay per character in seconds
     
+    _frame = None  # FrameBuffer collecting output while a frame is built
+    frame_stats = {}  # Size of the last flushed frame
+    _screen_lines = None  # (lines, start rows) of the last full-screen frame, None once anything else is printed
+    
+    # ANSI escapes; colorama translates them for older Windows consoles
+    CLEAR = "\x1b[2J\x1b[H"
+    _ESCAPE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+    
+    # Map symbol and colour for each room type shown on the map
+    MAP_SYMBOLS = {
+        UNKNOWN: ("?", None),
+        0: ("#", 'danger'),
+        1: (".", None),
+        3: ("D", 'danger'),
+        4: ("I", 'healing'),
+        5: ("M", 'clarity'),
+        6: ("T", 'memory'),
+        7: ("L", 'memory'),
+        8: ("S", 'memory'),
+        9: (">", 'title'),
+        10: ("<", 'title')
+    }
+    
+    MAP_RESERVED_LINES = 24  # Screen lines used by everything except the map rows
+    
+    _glyphs = None  # Rendered MAP_SYMBOLS, indexed by room type
+    
     @staticmethod
     def set_text_speed(speed):
         """Set text speed for slow_print."""
         Display._text_speed = max(0.0, min(speed, 0.1))
     
+    @staticmethod
+    def output():
+        """Where Display output goes: the current frame if one is open, else stdout."""
+        if Display._frame is not None:
+            return Display._frame
+        # Output after a frame may scroll it, so the next frame can't be diffed against it
+        Display._screen_lines = None
+        return sys.stdout
+    
+    @staticmethod
+    def begin_frame():
+        """Start collecting Display output instead of writing it straight away."""
+        Display._frame = FrameBuffer()
+    
+    @staticmethod
+    def end_frame():
+        """Write everything collected since begin_frame to stdout in one call."""
+        frame, Display._frame = Display._frame, None
+        if frame is None:
+            return
+        text = frame.getvalue()
+        if frame.screen:
+            text = Display._screen_update(text)
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        # Size of what was written, and how many writes were folded into it
+        Display.frame_stats = {'bytes': len(text.encode()), 'buffered_writes': frame.writes}
+    
+    @staticmethod
+    def _screen_update(text):
+        """Escapes that turn the last full-screen frame into this one.
+        
+        Only lines that differ, or that moved because a line above wrapped
+        differently, are rewritten, each with a cursor move. The diff relies
+        on rows staying put, so frames taller than the terminal are repainted
+        in full, as is any frame after other output.
+        """
+        lines = text.split("\n")
+        size = os.get_terminal_size()
+        columns = size.columns
+        widths = [len(Display._ESCAPE.sub("", line)) for line in lines]
+        # Terminal row each line starts on; lines wider than the terminal wrap
+        rows, row = [], 1
+        for width in widths:
+            rows.append(row)
+            row += max(1, -(-width // columns))
+        fits = row - 1 <= size.lines
+        previous, Display._screen_lines = Display._screen_lines, ((lines, rows) if fits else None)
+        if previous is None or not fits:
+            return Display.CLEAR + text
+        
+        old_lines, old_rows = previous
+        last = len(lines) - 1
+        parts = []
+        for i in range(last):
+            if i >= len(old_lines) or lines[i] != old_lines[i] or rows[i] != old_rows[i]:
+                # A line filling whole rows leaves the cursor on the last column, which ESC[K would erase
+                end = "\x1b[K" if widths[i] % columns or not widths[i] else ""
+                parts.append(f"\x1b[{rows[i]};1H{lines[i]}{end}")
+        # The last line is always rewritten so the cursor ends where a full repaint leaves it,
+        # after wiping whatever the last frame had from there down
+        parts.append(f"\x1b[{rows[last]};1H\x1b[J{lines[last]}")
+        return "".join(parts)
+    
     @staticmethod
     def clear_screen():
         """Clear the terminal screen."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        frame = Display._frame
+        if frame is not None:
+            # Inside a frame the clear is folded into end_frame's redraw
+            frame.seek(0)
+            frame.truncate()
+            frame.screen = True
+            return
+        Display._screen_lines = None
+        sys.stdout.write(Display.CLEAR)
+        sys.stdout.flush()
     
     @staticmethod
     def print_divider(char="-"):
         """Print a divider line."""
         width = min(os.get_terminal_size().columns, 80)
-        print(char * width)
+        print(char * width, file=Display.output())
     
     @staticmethod
     def print_centered(text):
         """Center text in the terminal."""
         width = min(os.get_terminal_size().columns, 80)
-        print(text.center(width))
+        print(text.center(width), file=Display.output())
     
     @staticmethod
     def print_centered_title(text):
         """Print a centered, colored title."""
         width = min(os.get_terminal_size().columns, 80)
         title = f"{Display.COLORS['title']}{text.center(width)}{Style.RESET_ALL}"
-        print("\n" + title + "\n")
+        print("\n" + title + "\n", file=Display.output())
     
     @staticmethod
     def print_message(text):
         """Print a normal message with newline."""
-        print(f"\n{text}")
+        print(f"\n{text}", file=Display.output())
     
     @staticmethod
     def print_hint(text):
         """Print a hint message in a subtle color."""
-        print(f"\n{Fore.CYAN}{text}{Style.RESET_ALL}")
+        print(f"\n{Fore.CYAN}{text}{Style.RESET_ALL}", file=Display.output())
     
     @staticmethod
     def print_position(x, y, room_type):
@@ -78,7 +192,9 @@ class Display:
             5: "Mirror Room",
             6: "Therapist's Office",
             7: "Loved One",
-            8: "Fellow Traveler"
+            8: "Fellow Traveler",
+            9: "Stairs Down",
+            10: "Stairs Up"
         }
         room_desc = room_descriptions.get(room_type, "Unknown")
         
@@ -93,12 +209,12 @@ class Display:
         elif room_type in [6, 7, 8]:  # NPCs
             color = Fore.MAGENTA
         
-        print(f"\n{Fore.CYAN}Current Position: [{x},{y}] - {color}{room_desc}{Style.RESET_ALL}")
+        print(f"\n{Fore.CYAN}Current Position: [{x},{y}] - {color}{room_desc}{Style.RESET_ALL}", file=Display.output())
     
     @staticmethod
     def print_actions(actions):
         """Print available actions in a formatted way."""
-        print(f"\n{Style.BRIGHT}Available Actions:{Style.RESET_ALL}")
+        print(f"\n{Style.BRIGHT}Available Actions:{Style.RESET_ALL}", file=Display.output())
         
         # Group by type (movement vs other)
         movement = []
@@ -108,33 +224,34 @@ class Display:
         for key, desc in actions:
             if key in ["↑", "↓", "→", "←"]:
                 movement.append((key, desc))
-            elif key in ["f", "t", "x", "k"]:  # Special interactions
+            elif key in ["f", "t", "x", "k", ">", "<"]:  # Special interactions
                 special.append((key, desc))
             else:
                 basic.append((key, desc))
         
         # Print movement keys with special formatting
         if movement:
-            print(f"{Display.COLORS['movement']}Movement: {Style.RESET_ALL}", end="")
+            print(f"{Display.COLORS['movement']}Movement: {Style.RESET_ALL}", end="", file=Display.output())
             move_text = ", ".join([f"{Display.COLORS['movement']}{key}{Style.RESET_ALL}: {desc}" for key, desc in movement])
-            print(move_text)
+            print(move_text, file=Display.output())
         
         # Print special actions
         if special:
-            print(f"{Display.COLORS['special']}Interactions:{Style.RESET_ALL}")
+            print(f"{Display.COLORS['special']}Interactions:{Style.RESET_ALL}", file=Display.output())
             for key, desc in special:
-                print(f"  {Display.COLORS['special']}{key}{Style.RESET_ALL}: {desc}")
+                print(f"  {Display.COLORS['special']}{key}{Style.RESET_ALL}: {desc}", file=Display.output())
         
         # Print basic actions
         if basic:
-            print(f"{Display.COLORS['action']}Basic Actions:{Style.RESET_ALL}")
+            print(f"{Display.COLORS['action']}Basic Actions:{Style.RESET_ALL}", file=Display.output())
             for key, desc in basic:
-                print(f"  {Display.COLORS['action']}{key}{Style.RESET_ALL}: {desc}")
+                print(f"  {Display.COLORS['action']}{key}{Style.RESET_ALL}: {desc}", file=Display.output())
     
     @staticmethod
     def slow_print(text, delay=None):
         """Print text slowly for dramatic effect."""
         delay = Display._text_speed if delay is None else delay
+        Display._screen_lines = None
         
         for char in text:
             sys.stdout.write(char)
@@ -145,6 +262,8 @@ class Display:
     @staticmethod
     def pause(message="Press Enter to continue..."):
         """Pause for player input."""
+        Display.end_frame()  # Anything buffered has to be on screen before waiting
+        Display._screen_lines = None
         input(f"\n{message}")
     
     @staticmethod
@@ -163,44 +282,79 @@ class Display:
         burden_empty = bar_length - burden_filled
         burden_bar = "█" * burden_filled + "░" * burden_empty
         
-        print(f"{Display.COLORS['hope']}Hope: [{hope_bar}] {hope}/100{Style.RESET_ALL}")
-        print(f"{Display.COLORS['danger']}Burden: [{burden_bar}] {burden}/100{Style.RESET_ALL}")
-    
-    @staticmethod
-    def display_map(world_map, player_x, player_y, revealed_map, path=None):
-        """Display the game map with fog of war."""
-        print("\nMap:")
-        
-        path_set = set(path) if path else set()
-        
-        for y in range(len(revealed_map)):
-            row = ""
-            for x in range(len(revealed_map[0])):
-                if x == player_x and y == player_y:
-                    row += Display.format_with_color("P ", "hope")
-                elif (x, y) in path_set and revealed_map[y][x] != -1:
-                    row += Display.format_with_color("· ", "clarity")
-                elif revealed_map[y][x] == -1:
-                    row += "? "
-                elif revealed_map[y][x] == 0:
-                    row += Display.format_with_color("# ", "danger")
-                elif revealed_map[y][x] == 1:
-                    row += ". "
-                elif revealed_map[y][x] == 3:
-                    row += Display.format_with_color("D ", "danger")
-                elif revealed_map[y][x] == 4:
-                    row += Display.format_with_color("I ", "healing")
-                elif revealed_map[y][x] == 5:
-                    row += Display.format_with_color("M ", "clarity")
-                elif revealed_map[y][x] == 6:
-                    row += Display.format_with_color("T ", "memory")
-                elif revealed_map[y][x] == 7:
-                    row += Display.format_with_color("L ", "memory")
-                elif revealed_map[y][x] == 8:
-                    row += Display.format_with_color("S ", "memory")
-            print(row)
-        
-        print("\nP=Player D=Demon I=Item M=Mirror T=Therapist L=Loved One S=Stranger #=Wall ?=Unknown")
+        print(f"{Display.COLORS['hope']}Hope: [{hope_bar}] {hope}/100{Style.RESET_ALL}", file=Display.output())
+        print(f"{Display.COLORS['danger']}Burden: [{burden_bar}] {burden}/100{Style.RESET_ALL}", file=Display.output())
+    
+    @staticmethod
+    def viewport_size():
+        """Rooms that fit on screen around the player, as (columns, rows)."""
+        size = os.get_terminal_size()
+        # Each room takes two characters; the rest of the frame needs about MAP_RESERVED_LINES
+        return max(min(size.columns, 80) // 2, 5), max(size.lines - Display.MAP_RESERVED_LINES, 5)
+    
+    @staticmethod
+    def _map_glyphs():
+        """Coloured two-character glyph for every room type, built once."""
+        if Display._glyphs is None:
+            glyphs = ["  "] * 256
+            for room_type, (symbol, emotion) in Display.MAP_SYMBOLS.items():
+                glyphs[room_type] = Display.format_with_color(symbol + " ", emotion) if emotion else symbol + " "
+            Display._glyphs = glyphs
+        return Display._glyphs
+    
+    @staticmethod
+    def display_map(world_map, player_x, player_y, revealed_map, path=None, viewport=None):
+        """Display the part of the map around the player, with fog of war.
+        
+        Only a viewport-sized window (the terminal size by default) is drawn,
+        so the cost of a frame depends on the screen, not the map.
+        """
+        print("\nMap:", file=Display.output())
+        
+        map_height, map_width = len(revealed_map), len(revealed_map[0])
+        view_width, view_height = viewport or Display.viewport_size()
+        # Centre on the player, sliding the window back inside the map at the edges
+        left = max(0, min(player_x - view_width // 2, map_width - view_width))
+        top = max(0, min(player_y - view_height // 2, map_height - view_height))
+        right, bottom = min(left + view_width, map_width), min(top + view_height, map_height)
+        
+        path_rows = {}
+        for x, y in path or ():
+            if left <= x < right and top <= y < bottom:
+                path_rows.setdefault(y, []).append(x)
+        
+        glyphs = Display._map_glyphs()
+        path_glyph = Display.format_with_color("· ", "clarity")
+        for y in range(top, bottom):
+            rooms = revealed_map[y][left:right]
+            row = [glyphs[room] for room in rooms]
+            for x in path_rows.get(y, ()):
+                if rooms[x - left] != UNKNOWN:
+                    row[x - left] = path_glyph
+            if y == player_y and left <= player_x < right:
+                row[player_x - left] = Display.format_with_color("P ", "hope")
+            print("".join(row), file=Display.output())
+        
+        print("\nP=Player D=Demon I=Item M=Mirror T=Therapist L=Loved One S=Stranger >/<=Stairs #=Wall ?=Unknown", file=Display.output())
+    
+    @staticmethod
+    def display_minimap(minimap, player_x, player_y):
+        """Display a small overview where each glyph summarises a block of rooms.
+        
+        A block shows P if the player is in it, D if it holds a known demon,
+        * for any other known special room, . for known open rooms, # if
+        only walls are known and ? if nothing in it has been seen.
+        """
+        glyphs = ["?", Display.format_with_color("#", "danger"), ".",
+                  Display.format_with_color("*", "special"), Display.format_with_color("D", "danger")]
+        block = minimap.block
+        
+        print(f"\nOverview (1 glyph = {block}x{block} rooms):", file=Display.output())
+        for row in range(minimap.rows):
+            line = [glyphs[minimap.level(column, row)] for column in range(minimap.columns)]
+            if row == player_y // block:
+                line[player_x // block] = Display.format_with_color("P", "hope")
+            print("".join(line), file=Display.output())
     
     @staticmethod
     def format_with_color(text, emotion):
@@ -3,6 +3,7 @@
 
 import json
 import os
+from data_structures.grid import Grid
 from utils.display import Display
 
 class SaveSystem:
@@ -29,11 +30,10 @@ class SaveSystem:
                     'inventory': game_state.player.inventory,
                     'memories': game_state.player.memories.display_all()
                 },
-                'world': {
-                    'map': game_state.world.map
-                },
+                'world': SaveSystem._world_data(game_state.world, slot),
+                'dungeon': SaveSystem._dungeon_data(game_state.dungeon, slot),
                 'game_phase': game_state.game_phase,
-                'move_history': game_state.move_history.items,
+                'move_history': game_state.move_history.to_list(),
                 'demons_faced': game_state.demons_faced,
                 'items_collected': game_state.items_collected
             }
@@ -44,6 +44,53 @@ class SaveSystem:
         except Exception as e:
             return f"Failed to save journey: {str(e)}"
     
+    @staticmethod
+    def _world_data(world, slot):
+        """Serializable world: the full map, a copy of its map file, or for
+        endless worlds the seed and chunk folder."""
+        if world.map_file:
+            # The file already holds every room; the slot gets a byte copy of it
+            map_file = f"{SaveSystem.SAVE_DIR}/map_slot_{slot}.bin"
+            return {
+                'map_file': map_file,
+                'width': world.width,
+                'height': world.height,
+                'checksum': world.save_map_file(map_file)
+            }
+        if not world.endless:
+            return {'map': world.map.to_rows()}
+        
+        # Endless maps are regenerated from the seed; only changed chunks are copied to the slot
+        chunk_dir = f"{SaveSystem.SAVE_DIR}/endless_slot_{slot}"
+        world.save_chunks(chunk_dir)
+        return {
+            'endless': True,
+            'seed': world.seed,
+            'chunk_size': world.chunk_size,
+            'chunk_dir': chunk_dir,
+            'map_generation': world.map_generation
+        }
+    
+    @staticmethod
+    def _dungeon_data(dungeon, slot):
+        """Serializable dungeon: its settings and the folder holding changed floors."""
+        if dungeon is None:
+            return None
+        
+        # Floors are regenerated from the seed; only changed ones are copied to the slot
+        page_dir = f"{SaveSystem.SAVE_DIR}/dungeon_slot_{slot}"
+        dungeon.save_floors(page_dir)
+        return {
+            'floors': dungeon.floor_count,
+            'width': dungeon.width,
+            'height': dungeon.height,
+            'seed': dungeon.seed,
+            'stairs_per_floor': dungeon.stairs_per_floor,
+            'wall_density': dungeon.wall_density,
+            'page_dir': page_dir,
+            'current': dungeon.current
+        }
+    
     @staticmethod
     def load_game(game_state, slot):
         """Load game state from a file."""
@@ -61,12 +108,34 @@ class SaveSystem:
             game_state.player.inventory = save_data['player']['inventory']
             
             # Restore memories
-            game_state.player.memories = game_state.player.memories.__class__()
-            for memory in save_data['player']['memories']:
-                game_state.player.memories.append(memory)
+            game_state.player.load_memories(save_data['player']['memories'])
             
             # Restore world
-            game_state.world.map = save_data['world']['map']
+            world_data = save_data['world']
+            dungeon_data = save_data.get('dungeon')
+            if dungeon_data:
+                # Imported here to avoid circular imports
+                from core.dungeon import Dungeon
+                dungeon = Dungeon(dungeon_data['floors'], dungeon_data['width'], dungeon_data['height'],
+                                  dungeon_data['seed'], dungeon_data['stairs_per_floor'],
+                                  dungeon_data['wall_density'])
+                # Play goes on in a copy, so floors paged out later don't change the save
+                dungeon.load_floors(dungeon_data['page_dir'])
+                dungeon.go_to_floor(dungeon_data['current'])
+                game_state.dungeon = dungeon
+                game_state.enter_floor(game_state.player.position)
+            elif world_data.get('endless'):
+                game_state.world.restore_endless(world_data['seed'], world_data['chunk_size'],
+                                                 world_data['chunk_dir'], world_data['map_generation'])
+            elif 'map_file' in world_data:
+                game_state.world.restore_map_file(world_data['map_file'], world_data['width'],
+                                                  world_data['height'], world_data['checksum'])
+            else:
+                game_state.world.endless = False
+                game_state.world.map_file = None
+                game_state.world.replace_map(Grid.from_rows(world_data['map']))
+            if not dungeon_data:
+                game_state.dungeon = None
             
             # Restore game state
             game_state.game_phase = save_data['game_phase']
@@ -74,9 +143,9 @@ class SaveSystem:
             game_state.items_collected = save_data.get('items_collected', 0)
             
             # Restore move history
-            game_state.move_history = game_state.move_history.__class__()
+            game_state.move_history.clear()
             for move in save_data['move_history']:
-                game_state.move_history.push(move)
+                game_state.move_history.push(tuple(move))
             
             Display.print_message(f"Journey loaded from slot {slot}")
             